@@ -1,8 +1,11 @@
 # bank_strategies.py
 import re
 import os
+import itertools
+import calendar
+import functools
 from abc import ABC, abstractmethod
-from typing import List, Optional, Dict
+from typing import List, Optional, Dict, Tuple, Iterable
 from datetime import datetime, timedelta
 import logging
 import Levenshtein # For fuzzy name matching
@@ -13,29 +16,140 @@ from config_manager import ConfigManager
 
 # --- Helper Functions (Consider moving to utils.py later) ---
 
+# Custom level below DEBUG for per-line tracing. Loops check it once via isEnabledFor
+# so disabled traces cost nothing per line.
+TRACE = logging.DEBUG - 5
+
+def _parse_mdy(date_str: str, formats: List[str]) -> Optional[datetime]:
+    """Fast path for the numeric 'm/d/Y' and 'm/d/y' shapes, avoiding strptime."""
+    parts = date_str.split('/')
+    if len(parts) != 3:
+        return None
+    month, day, year = parts
+    if not (date_str.isascii() and 0 < len(month) <= 2 and 0 < len(day) <= 2 and month.isdigit() and day.isdigit() and year.isdigit()):
+        return None
+    if len(year) == 4 and '%m/%d/%Y' in formats:
+        year_num = int(year)
+    elif len(year) == 2 and '%m/%d/%y' in formats:
+        year_num = int(year)
+        year_num += 2000 if year_num < 69 else 1900 # Same pivot as strptime's %y
+    else:
+        return None
+    try:
+        return datetime(year_num, int(month), int(day))
+    except ValueError:
+        return None
+
+# 'Month D, YYYY' shape for the '%B %d, %Y' / '%b %d, %Y' formats; month names come from the same locale strptime uses
+_MONTH_NAME_DATE_PATTERN = re.compile(r'([A-Za-z]+)\s+(\d{1,2}),\s+(\d{4})')
+_MONTH_NAME_FORMATS = {
+    '%B %d, %Y': {name.lower(): number for number, name in enumerate(calendar.month_name) if name},
+    '%b %d, %Y': {name.lower(): number for number, name in enumerate(calendar.month_abbr) if name},
+}
+
+def _parse_month_name_date(date_str: str, formats: List[str]) -> Optional[datetime]:
+    """Fast path for 'March 31, 2024' style dates: one shape match and a month lookup instead of a strptime ladder."""
+    match = _MONTH_NAME_DATE_PATTERN.fullmatch(date_str) if date_str.isascii() else None
+    if not match:
+        return None
+    month_name = match.group(1).lower()
+    for fmt in formats: # First listed month format that knows the name wins, as with strptime
+        month = _MONTH_NAME_FORMATS.get(fmt, {}).get(month_name)
+        if month:
+            try:
+                return datetime(int(match.group(3)), month, int(match.group(2)))
+            except ValueError:
+                return None
+    return None
+
 def parse_date(date_str: Optional[str], formats: List[str]) -> Optional[datetime]:
     """Helper to parse dates with multiple potential formats."""
     if not date_str:
         return None
+    date_str = date_str.strip()
+    parsed = _parse_mdy(date_str, formats) or _parse_month_name_date(date_str, formats)
+    if parsed:
+        return parsed
     for fmt in formats:
         try:
-            return datetime.strptime(date_str.strip(), fmt)
+            return datetime.strptime(date_str, fmt)
         except (ValueError, TypeError):
             continue
     logging.debug(f"Could not parse date string '{date_str}' with formats {formats}")
     return None
 
+# Fund name cleanup: drop ',' and '.', cut a trailing "Tax ID ..." and collapse whitespace
+_FUND_NAME_PUNCTUATION = str.maketrans('', '', ',.')
+_TAX_ID_SUFFIX_PATTERN = re.compile(r'\s+TAX\s+ID.*$')
+_WHITESPACE_PATTERN = re.compile(r'\s+')
+
+def _normalize_fund_name(name: str) -> str:
+    """Upper-cases and cleans an extracted fund name in one pass per step."""
+    cleaned = _TAX_ID_SUFFIX_PATTERN.sub('', name.upper().translate(_FUND_NAME_PUNCTUATION))
+    return _WHITESPACE_PATTERN.sub(' ', cleaned).strip()
+
+@functools.lru_cache(maxsize=32)
+def _normalized_sensitive_names(names: Tuple[str, ...]) -> Tuple[str, ...]:
+    """Upper-cased, stripped sensitive names in list order, normalized once per sensitive list."""
+    return tuple(name.upper().strip() for name in names)
+
+class _DigitsOnlyTable(dict):
+    """str.translate table that deletes every non-decimal character (same set as re's \\D), filled in lazily."""
+    def __missing__(self, codepoint: int) -> Optional[int]:
+        kept = codepoint if chr(codepoint).isdecimal() else None
+        self[codepoint] = kept
+        return kept
+
+_DIGITS_ONLY = _DigitsOnlyTable()
+
+@functools.lru_cache(maxsize=32)
+def _sensitive_number_index(numbers: Tuple[str, ...]) -> Tuple[Dict[str, int], Dict[str, int]]:
+    """Maps each normalized sensitive number, and its last 4 digits, to the first account index holding it."""
+    full_index: Dict[str, int] = {}
+    last4_index: Dict[str, int] = {}
+    for index, number in enumerate(numbers):
+        normalized = number.translate(_DIGITS_ONLY)
+        if not normalized: continue
+        full_index.setdefault(normalized, index)
+        if len(normalized) >= 4:
+            last4_index.setdefault(normalized[-4:], index)
+    return full_index, last4_index
+
+# Berkshire filename heuristics: "_XXXX.pdf" last 4 digits (NewStatement files) and a YYYY-MM-DD/YYYYMMDD date
+_BERKSHIRE_FILENAME_LAST4_PATTERN = re.compile(r'_(\d{4})(?:\.pdf)?$')
+_BERKSHIRE_FILENAME_DATE_PATTERN = re.compile(r'(\d{4}[-_]?\d{2}[-_]?\d{2})')
+
+@functools.lru_cache(maxsize=4096)
+def _berkshire_filename_hints(original_filename: str) -> Tuple[bool, Optional[str], Optional[datetime]]:
+    """
+    Returns (is NewStatement format, last 4 digits, date) parsed from a Berkshire filename.
+    Cached so retries and re-scans of the same file skip the regexes.
+    """
+    filename_lower = original_filename.lower()
+    is_new_statement = "newstatement" in filename_lower or "new_statement" in filename_lower
+    last4 = None
+    if is_new_statement:
+        match = _BERKSHIRE_FILENAME_LAST4_PATTERN.search(original_filename) # Looking for _XXXX.pdf
+        last4 = match.group(1) if match else None
+    date_match = _BERKSHIRE_FILENAME_DATE_PATTERN.search(original_filename)
+    parsed_date = parse_date(date_match.group(1).replace('-','').replace('_',''), ['%Y%m%d']) if date_match else None
+    return is_new_statement, last4, parsed_date
+
+# Characters invalid in filenames (<>:"/\|?* and control characters) all map to '_'
+_INVALID_FILENAME_CHARS = str.maketrans({char: '_' for char in '<>:"/\\|?*' + ''.join(map(chr, range(0x20)))})
+
+@functools.lru_cache(maxsize=4096)
 def sanitize_filename(filename: Optional[str], allow_spaces=False) -> str:
-    """Sanitize a filename to be safe for use in file systems."""
+    """Sanitize a filename to be safe for use in file systems (cached: the same names recur across a batch)."""
     if not filename:
         return "sanitized_filename"
     # Remove or replace invalid characters
-    sanitized = re.sub(r'[<>:"/\\|?*\x00-\x1f]', '_', filename)
+    sanitized = filename.translate(_INVALID_FILENAME_CHARS)
     # Consolidate whitespace (including newlines etc.)
     if allow_spaces:
-        sanitized = re.sub(r'\s+', ' ', sanitized).strip()
+        sanitized = _WHITESPACE_PATTERN.sub(' ', sanitized).strip()
     else:
-        sanitized = re.sub(r'\s+', '_', sanitized).strip() # Default: replace space with underscore
+        sanitized = _WHITESPACE_PATTERN.sub('_', sanitized).strip() # Default: replace space with underscore
     # Remove leading/trailing problematic chars like spaces, periods, underscores
     sanitized = sanitized.strip(' _.')
     # Ensure not empty after sanitization
@@ -47,12 +161,18 @@ def sanitize_filename(filename: Optional[str], allow_spaces=False) -> str:
 class BankStrategy(ABC):
     """Abstract base class for bank-specific processing strategies."""
 
+    # Account, name and date all sit in the statement header, so extraction never looks past this many lines
+    HEADER_SCAN_LIMIT = 120
+
     def __init__(self, config: ConfigManager):
         self.config = config
 
     @abstractmethod
-    def extract_info(self, lines: List[str], statement_info: StatementInfo):
-        """Extract bank-specific information into the StatementInfo object."""
+    def extract_info(self, lines: Iterable[str], statement_info: StatementInfo):
+        """
+        Extract bank-specific information into the StatementInfo object.
+        `lines` may be a lazy iterator; strategies that need more than one pass must list() it first.
+        """
         # Subclasses MUST set statement_info.bank_type
         pass
 
@@ -83,45 +203,53 @@ class BankStrategy(ABC):
         """Checks if a number matches (full or last 4) a sensitive account number."""
         if not number_to_check or not sensitive_accounts:
             return None
-        normalized_check = re.sub(r'\D', '', number_to_check) # Remove non-digits
+        normalized_check = number_to_check.translate(_DIGITS_ONLY) # Remove non-digits
         if not normalized_check:
             return None
         check_last4 = normalized_check[-4:]
 
-        for account in sensitive_accounts:
-            sensitive_number = account.get('number')
-            if not sensitive_number: continue
-            normalized_sensitive = re.sub(r'\D', '', str(sensitive_number))
-            if not normalized_sensitive: continue
-            
-            # Prioritize full number match
-            if normalized_check == normalized_sensitive:
-                logging.debug(f"Sensitive match found based on full account number: {normalized_check}")
-                return account
-            
-            # Check last 4 digits if full match failed
-            sensitive_last4 = normalized_sensitive[-4:]
-            # Ensure we have at least 4 digits to compare
-            if len(normalized_check) >= 4 and len(normalized_sensitive) >=4 and check_last4 == sensitive_last4:
-                logging.debug(f"Sensitive match found based on last 4 digits: {check_last4}")
-                return account
+        # Normalized numbers are indexed once per sensitive list (cached), so a lookup is two dict probes
+        numbers = tuple(str(account.get('number') or '') for account in sensitive_accounts)
+        full_index, last4_index = _sensitive_number_index(numbers)
+        full_match = full_index.get(normalized_check)
+        # Ensure we have at least 4 digits to compare
+        last4_match = last4_index.get(check_last4) if len(normalized_check) >= 4 else None
+
+        # The earliest matching account wins; on the same account the full number match takes priority
+        if full_match is not None and (last4_match is None or full_match <= last4_match):
+            logging.debug(f"Sensitive match found based on full account number: {normalized_check}")
+            return sensitive_accounts[full_match]
+        if last4_match is not None:
+            logging.debug(f"Sensitive match found based on last 4 digits: {check_last4}")
+            return sensitive_accounts[last4_match]
         return None
 
     def _find_sensitive_match_by_name(self, name_to_check: str, sensitive_accounts: List[Dict], threshold=0.85) -> Optional[Dict]:
-        """Checks if a name fuzzy-matches a sensitive account name."""
+        """
+        Checks if a name fuzzy-matches a sensitive account name. Every name is considered in list order (a later
+        name with an equal ratio wins); names whose length alone keeps them below the best ratio so far are skipped.
+        """
         if not name_to_check or not sensitive_accounts:
             return None
         best_match = None
         highest_ratio = threshold # Require at least this similarity
         check_name_norm = name_to_check.upper().strip()
-
-        for account in sensitive_accounts:
-            sensitive_name = account.get('name')
-            if not sensitive_name: continue
-            sensitive_name_norm = sensitive_name.upper().strip()
-            
-            # Calculate similarity ratio
-            ratio = Levenshtein.ratio(check_name_norm, sensitive_name_norm)
+        check_len = len(check_name_norm)
+
+        normalized_names = _normalized_sensitive_names(tuple(account.get('name') or '' for account in sensitive_accounts))
+        for account, sensitive_name_norm in zip(sensitive_accounts, normalized_names):
+            if not account.get('name'): continue # A whitespace-only name still compares (as '')
+
+            # Levenshtein.ratio can't exceed 2*min(len)/(len sum), so the length gap alone rules some names out.
+            # The bound gets one edit of slack, like the cutoff below, so float rounding never skips a tie
+            total_len = check_len + len(sensitive_name_norm)
+            if 2 * min(check_len, len(sensitive_name_norm)) + 1 < highest_ratio * total_len:
+                continue
+
+            # Calculate similarity ratio. The cutoff lets the bit-parallel kernel stop early (it returns 0.0 below it);
+            # it is loosened by one edit so float rounding never rejects a ratio exactly at highest_ratio
+            cutoff = max(0.0, highest_ratio - 1 / total_len) if total_len else 0.0
+            ratio = Levenshtein.ratio(check_name_norm, sensitive_name_norm, score_cutoff=cutoff)
             
             if ratio >= highest_ratio:
                 highest_ratio = ratio
@@ -135,136 +263,175 @@ class BankStrategy(ABC):
 
 # --- Concrete Strategies ---
 
+# --- PNC Patterns ---
+
+# Account number, either full (e.g. "Account Number: 12-3456-7890") or masked to the last 4 digits
+_PNC_ACCOUNT_PATTERN = re.compile(r'Account\s+Number:?\s*(\d[\d-]{5,}\d)\b', re.IGNORECASE)
+_PNC_ACCOUNT_LAST4_PATTERN = re.compile(r'Account\s+Number:?\s*[X*]+-?(\d{4})\b', re.IGNORECASE)
+# Statement period, e.g. "For the Period 04/01/2025 to 04/30/2025" (captures the end date)
+_PNC_DATE_PATTERN = re.compile(r'For\s+the\s+Period\s+\d{1,2}/\d{1,2}/\d{2,4}\s*(?:to|-)\s*(\d{1,2}/\d{1,2}/\d{2,4})', re.IGNORECASE)
+_PNC_DATE_FORMATS = ['%m/%d/%Y', '%m/%d/%y']
+# Literal words the patterns above require; a cheap `in` test on the upper-cased line rejects most lines before any regex runs
+_PNC_ACCOUNT_ANCHOR = 'ACCOUNT'
+_PNC_DATE_ANCHOR = 'PERIOD'
+_PNC_ARC_ANCHOR = 'IMPACT'
+_PNC_ACCOUNT_NUMBER_LABEL = 'ACCOUNT NUMBER'
+
+# Old: r'(ARC[\s-]IMPACT\s+PROGRAM(?:\s+(?:ERIE|SWPA|LIMA|PITTSBURGH|BUFFALO|HARTFORD|CUYAHOGA|CT))?(?:\s+LLC)?)'
+_PNC_ARC_IMPACT_PATTERN = re.compile(r'([A-Z\s-]+IMPACT\s+PROGRAM(?:\s+([A-Z\s-]+))?(?:\s+LLC)?)', re.IGNORECASE) # Generalized ARC, and location list
+# Each name/fund pattern is paired with a literal it cannot match without, so the upper-cased line is checked with
+# `in` first; the LLC patterns backtrack heavily on long lines that lack "LLC". There is deliberately no catch-all:
+# any two words on a header line (a trustee, an address) would otherwise become the account name
+_PNC_ACCOUNT_NAME_PATTERNS = [
+    # Old: r'ARCTARIS\s+PRODUCT\s+DEV(?:ELOPMENT)?\s+([IVX]+)'
+    ('PRODUCT', re.compile(r'([A-Z\s]+PRODUCT\s+DEV(?:ELOPMENT)?)\s+([IVX]+)', re.IGNORECASE)), # Captures "Generic Product Dev" and Roman numeral separately
+    # Old: r'ARCTARIS\s+PRODUCT\s+DEV(?:ELOPMENT)?\s+(\d+)'
+    ('PRODUCT', re.compile(r'([A-Z\s]+PRODUCT\s+DEV(?:ELOPMENT)?)\s+(\d+)', re.IGNORECASE)), # Captures "Generic Product Dev" and number separately
+    ('PRODUCT', re.compile(r'(PRODUCT\s+DEV(?:ELOPMENT)?)\s+([IVX]+|[0-9]+)', re.IGNORECASE)), # Already somewhat generic, captures "PRODUCT DEV" and num/roman
+    # Old: r'PHASE\s+([0-9]+[A-Z]?)\s+HOLDINGS'
+    ('HOLDINGS', re.compile(r'([A-Z][A-Z\s]*?)\s+([0-9]+[A-Z]?)\s+(HOLDINGS)\b', re.IGNORECASE)) # e.g. "PHASE 2 HOLDINGS"
+]
+_PNC_FUND_PATTERNS = [
+    ('CDE', re.compile(r'([A-Z\s]*[-]?\s*CDE\s+[0-9]+\s+LLC)', re.IGNORECASE)), # Generalized "
+    ('CDE', re.compile(r'(?:[A-Z\s]*-)?CDE[^A-Za-z0-9]*([0-9]+)[^A-Za-z0-9]*LLC', re.IGNORECASE)), # 
+    ('CDE', re.compile(r'((?:[A-Z\s]*-)?CDE[^A-Za-z0-9]*[0-9]+[^A-Za-z0-9]*LLC)', re.IGNORECASE)), # 
+    ('PRODUCT', re.compile(r'([A-Z\s]+PRODUCT\s+DEV(?:ELOPMENT)?\s+(?:[IVX]+|[0-9]+))', re.IGNORECASE)), # 
+    ('LLC', re.compile(r'([A-Z\s]+[^A-Za-z0-9]*(?:[A-Z\s0-9\-]+)[^A-Za-z0-9]*LLC)', re.IGNORECASE)), # 
+    ('LLC', re.compile(r'^([A-Za-z0-9\s,.\-]+)\s+LLC', re.IGNORECASE)), # Already generic
+    ('FUND', re.compile(r'([A-Za-z0-9\s,.\-]+FUND[A-Za-z0-9\s,.\-]*) ', re.IGNORECASE)), # A
+    ('OPPORTUNITY', re.compile(r'([A-Za-z]+\s+OPPORTUNITY\s+ZONE[A-Za-z\s]+)', re.IGNORECASE)) # 
+]
+
+
 class PNCStrategy(BankStrategy):
     """Strategy for processing PNC Bank statements."""
 
     def get_bank_name(self) -> str:
         return "PNC"
 
-    def extract_info(self, lines: List[str], statement_info: StatementInfo):
+    def _find_account(self, lines: List[str], upper_lines: List[str], sensitive_accounts: List[Dict]) -> Tuple[Optional[str], Optional[Dict]]:
+        """Returns the first account number found in the lines and its sensitive match (if any)."""
+        for line, line_upper in zip(lines, upper_lines):
+            if _PNC_ACCOUNT_ANCHOR not in line_upper:
+                continue
+            match = _PNC_ACCOUNT_PATTERN.search(line) or _PNC_ACCOUNT_LAST4_PATTERN.search(line)
+            if match:
+                account_num = match.group(1)
+                return account_num, self._find_sensitive_match_by_number(account_num, sensitive_accounts)
+        return None, None
+
+    def _extract_fund_name(self, line: str, line_upper: str) -> Optional[str]:
+        """Extracts a candidate fund/account name from a single line (line_upper is line.upper())."""
+        match = _PNC_ARC_IMPACT_PATTERN.search(line) if _PNC_ARC_ANCHOR in line_upper else None
+        if match:
+            return match.group(1).upper().strip()
+        for idx, (anchor, pattern) in enumerate(_PNC_ACCOUNT_NAME_PATTERNS):
+            match = pattern.search(line) if anchor in line_upper else None
+            if match:
+                # Adjust construction based on new capture groups
+                if idx == 3: # For "WORDS NUMERIC_ID HOLDINGS"
+                    return f"{match.group(1)} {match.group(2)} {match.group(3)}".upper().strip()
+                return f"{match.group(1)} {match.group(2)}".upper().strip() # "Generic Product Dev" + Roman/Number
+        for anchor, pattern in _PNC_FUND_PATTERNS:
+            if anchor not in line_upper:
+                continue
+            match = pattern.search(line)
+            if match:
+                cleaned = _normalize_fund_name(match.group(1))
+                if len(cleaned) > 3 and "SUMMARY" not in cleaned:
+                    return cleaned
+        return None
+
+    def _find_fund(self, lines: List[str], upper_lines: List[str], sensitive_accounts: List[Dict]) -> Tuple[Optional[str], Optional[Dict]]:
+        """
+        Returns the first fund name confirmed by the sensitive list, stopping at that line.
+        If none is confirmed, returns the last regex candidate (each later line overrides) with no sensitive match.
+        """
+        # Boilerplate header lines (bank name, contact and tax lines, the period and account lines) never carry the fund
+        # name, and the broad fund patterns would otherwise pick their words up as one
+        patterns = self.config.base.patterns
+        skip_starters = tuple(s.upper() for s in patterns.skip_starters)
+        period_marker = patterns.period_marker.upper()
+        tentative_name = None
+        for line, line_upper in zip(lines, upper_lines):
+            if line_upper.lstrip().startswith(skip_starters) or period_marker in line_upper or _PNC_ACCOUNT_NUMBER_LABEL in line_upper:
+                continue
+            potential_fund_name = self._extract_fund_name(line, line_upper)
+            if not potential_fund_name:
+                continue
+            sensitive_match = self._find_sensitive_match_by_name(potential_fund_name, sensitive_accounts)
+            if sensitive_match:
+                return potential_fund_name, sensitive_match
+            tentative_name = potential_fund_name
+        return tentative_name, None
+
+    def _find_date(self, lines: List[str], upper_lines: List[str]) -> Optional[datetime]:
+        """Returns the statement period end date from the first line that yields one."""
+        for line, line_upper in zip(lines, upper_lines):
+            if _PNC_DATE_ANCHOR not in line_upper:
+                continue
+            match = _PNC_DATE_PATTERN.search(line)
+            if match:
+                parsed_date = self._parse_date(match.group(1).strip(), _PNC_DATE_FORMATS)
+                if parsed_date:
+                    return parsed_date
+        return None
+
+    def extract_info(self, lines: Iterable[str], statement_info: StatementInfo):
         # Initialize
         statement_info.bank_type = self.get_bank_name()
         statement_info.match_status = "Default_Name" # Initial status
         pnc_mappings = self.config.get_account_mappings("pnc") 
         arc_impact_mappings = self.config.get_account_mappings("pnc_special_mapping_last4")
         sensitive_accounts = self.config.get_sensitive_accounts(self.get_bank_name())
-        account_found = False; fund_found = False; date_found = False; sensitive_match_made = False
-        
-        # Regex patterns (Generalized)
-        # Old: r'(ARC[\\s-]IMPACT\\s+PROGRAM(?:\\s+(?:ERIE|SWPA|LIMA|PITTSBURGH|BUFFALO|HARTFORD|CUYAHOGA|CT))?(?:\\s+LLC)?)'
-        arc_impact_pattern = re.compile(r'([A-Z\\s-]+IMPACT\\s+PROGRAM(?:\\s+([A-Z\\s-]+))?(?:\\s+LLC)?)', re.IGNORECASE) # Generalized ARC, and location list
-        account_name_patterns = [
-            # Old: r'ARCTARIS\\s+PRODUCT\\s+DEV(?:ELOPMENT)?\\s+([IVX]+)'
-            re.compile(r'([A-Z\\s]+PRODUCT\\s+DEV(?:ELOPMENT)?)\\s+([IVX]+)', re.IGNORECASE), # Captures "Generic Product Dev" and Roman numeral separately
-            # Old: r'ARCTARIS\\s+PRODUCT\\s+DEV(?:ELOPMENT)?\\s+(\\d+)'
-            re.compile(r'([A-Z\\s]+PRODUCT\\s+DEV(?:ELOPMENT)?)\\s+(\\d+)', re.IGNORECASE), # Captures "Generic Product Dev" and number separately
-            re.compile(r'(PRODUCT\\s+DEV(?:ELOPMENT)?)\\s+([IVX]+|[0-9]+)', re.IGNORECASE), # Already somewhat generic, captures "PRODUCT DEV" and num/roman
-            # Old: r'PHASE\\s+([0-9]+[A-Z]?)\\s+HOLDINGS'
-            re.compile(r'([A-Z\\s]+)\\s+([0-9]+[A-Z]?)\\s+([A-Z\\s]+)', re.IGNORECASE) # e.g. "ANY_WORDS NUMERIC_ID ANY_WORDS"
-        ]
-        fund_patterns = ['
-            re.compile(r'([A-Z\\s]*[-]?\\s*CDE\\s+[0-9]+\\s+LLC)', re.IGNORECASE), # Generalized "
-            re.compile(r'(?:[A-Z\\s]*-)?CDE[^A-Za-z0-9]*([0-9]+)[^A-Za-z0-9]*LLC', re.IGNORECASE), # 
-            re.compile(r'((?:[A-Z\\s]*-)?CDE[^A-Za-z0-9]*[0-9]+[^A-Za-z0-9]*LLC)', re.IGNORECASE), # 
-            re.compile(r'([A-Z\\s]+PRODUCT\\s+DEV(?:ELOPMENT)?\\s+(?:[IVX]+|[0-9]+))', re.IGNORECASE), # 
-            re.compile(r'([A-Z\\s]+[^A-Za-z0-9]*(?:[A-Z\\s0-9\\-]+)[^A-Za-z0-9]*LLC)', re.IGNORECASE), # 
-            re.compile(r'^([A-Za-z0-9\\s,.\\-]+)\\s+LLC', re.IGNORECASE), # Already generic
-            re.compile(r'(?:[A-Z\\s]+)\\s+([A-Za-z0-9\\s,.\\-]+?)(?:\\s+LLC|$)', re.IGNORECASE), # 
-            re.compile(r'([A-Za-z0-9\\s,.\\-]+FUND[A-Za-z0-9\\s,.\\-]*) ', re.IGNORECASE), # A
-            re.compile(r'([A-Za-z]+\\s+[A-Z\\s]+[A-Za-z\\s]+)', re.IGNORECASE), # Generalized "EAST COAST"
-            re.compile(r'([A-Za-z]+\\s+OPPORTUNITY\\s+ZONE[A-Za-z\\s]+)', re.IGNORECASE) # 
-        ]
-
-        logging.debug(f"PNC: Starting line processing. Sensitive accounts: {len(sensitive_accounts)}")
-        for i, line in enumerate(lines):
-            if not line.strip(): break
-            if sensitive_match_made and date_found: break # Optimization: if definitive match and date, stop early
-            logging.log(logging.DEBUG - 5 , f"PNC Line {i+1}: {line.strip()}")
-
-            # 1. Attempt Number Extraction & Sensitive Match
-            potential_account_num = None
-            if not account_found:
-                match = account_pattern.search(line) or account_last4_pattern.search(line)
-                if match: 
-                    potential_account_num = match.group(1)
-                    sensitive_match = self._find_sensitive_match_by_number(potential_account_num, sensitive_accounts)
-                    if sensitive_match:
-                        statement_info.account_number = sensitive_match['number']
-                        statement_info.account_name = sensitive_match['name']
-                        statement_info.match_status = "Success! (Sensitive Number)"
-                        logging.info(f"PNC: Confirmed account via sensitive number match: {statement_info.account_name}")
-                        account_found = fund_found = sensitive_match_made = True 
-                        # continue # Removed continue to allow date search on same line
-                    else: 
-                        num = potential_account_num
-                        statement_info.account_number = num.replace('-', '') if '-' in num or len(num) > 4 else f"xxxx{num[-4:]}"
-                        statement_info.match_status = "Regex Match (Review)" # Tentative
-                        account_found = True
-                        logging.debug(f"PNC: Regex found potential account '{statement_info.account_number}', no sensitive match.")
-
-            # 2. Attempt Name Extraction & Sensitive Match
-            if not fund_found or not sensitive_match_made: # Try even if num found, to confirm/upgrade name
-                potential_fund_name = None
-                match = arc_impact_pattern.search(line)
-                if match: 
-                  
-                    base_name = match.group(1)
-                    
-                    potential_fund_name = base_name.upper().strip()
-
-                else:
-                    for idx, pattern in enumerate(account_name_patterns):
-                        match = pattern.search(line)
-                        if match:
-                            # Adjust construction based on new capture groups
-                            if idx == 0 or idx == 1: # For "Generic Product Dev" + Roman/Number
-                                potential_fund_name = f"{match.group(1)} {match.group(2)}".upper().strip()
-                            elif idx == 2: # 
-                                potential_fund_name = f"{match.group(1)} {match.group(2)}".upper().strip()
-                            elif idx == 3: # For "ANY_WORDS NUMERIC_ID ANY_WORDS" 
-                                potential_fund_name = f"{match.group(1)} {match.group(2)} {match.group(3)}".upper().strip()
-                            break
-                    if not potential_fund_name:
-                        for pattern in fund_patterns:
-                            match = pattern.search(line)
-                            if match:
-                                extracted = match.group(1).strip(); cleaned = extracted.replace(',','').replace('.','')
-                                cleaned = re.sub(r'\s+Tax\s+ID.*$', '', cleaned, flags=re.IGNORECASE).strip(); cleaned = re.sub(r'\s+', ' ', cleaned).upper()
-                                if len(cleaned) > 3 and "SUMMARY" not in cleaned:
-                                    potential_fund_name = cleaned; break
-                
-                if potential_fund_name:
-                    sensitive_match = self._find_sensitive_match_by_name(potential_fund_name, sensitive_accounts)
-                    if sensitive_match:
-                        statement_info.account_name = sensitive_match['name']
-                        statement_info.match_status = "Success! (Sensitive Name)" # Upgrade/set status
-                        fund_found = True
-                        if not account_found: 
-                            statement_info.account_number = sensitive_match['number']
-                            account_found = True
-                        elif statement_info.account_number != sensitive_match['number']:
-                            logging.warning(f"PNC: Sensitive name '{statement_info.account_name}' num {sensitive_match['number']} != earlier num {statement_info.account_number}. Prioritizing sensitive.")
-                            statement_info.account_number = sensitive_match['number']
-                        sensitive_match_made = True # Definitive match for name (and possibly number)
-                        logging.info(f"PNC: Confirmed account via sensitive name match: {statement_info.account_name}")
-                    elif not sensitive_match_made: # Only set tentative name if no sensitive match confirmed anything yet
-                        statement_info.account_name = potential_fund_name
-                        if statement_info.match_status not in ["Success! (Sensitive Number)"]:
-                            statement_info.match_status = "Regex Match (Review)"
-                        fund_found = True
-                        logging.debug(f"PNC: Regex found potential name '{potential_fund_name}', no sensitive match.")
-
-            # 3. Attempt Date Extraction
-            if not date_found:
-                match = date_pattern.search(line)
-                if match: 
-                    parsed_date = self._parse_date(match.group(1).strip(), ['%m/%d/%Y', '%m/%d/%y'])
-                    if parsed_date: 
-                        statement_info.date = parsed_date
-                        date_found = True
-                        logging.debug(f"PNC: Found date {parsed_date:%Y-%m-%d}")
+        account_found = False; fund_found = False; sensitive_match_made = False
+
+        # The header block ends at the first blank line; each field search below stops at its first hit
+        header_lines = list(itertools.takewhile(str.strip, itertools.islice(lines, self.HEADER_SCAN_LIMIT)))
+        header_upper = [line.upper() for line in header_lines] # Upper-cased once, shared by every anchor check
+        logging.debug(f"PNC: Searching {len(header_lines)} header lines. Sensitive accounts: {len(sensitive_accounts)}")
+
+        # 1. Account Number & Sensitive Match
+        potential_account_num, sensitive_match = self._find_account(header_lines, header_upper, sensitive_accounts)
+        if sensitive_match:
+            statement_info.account_number = sensitive_match['number']
+            statement_info.account_name = sensitive_match['name']
+            statement_info.match_status = "Success! (Sensitive Number)"
+            logging.info(f"PNC: Confirmed account via sensitive number match: {statement_info.account_name}")
+            account_found = fund_found = sensitive_match_made = True
+        elif potential_account_num:
+            num = potential_account_num
+            statement_info.account_number = num.replace('-', '') if '-' in num or len(num) > 4 else f"xxxx{num[-4:]}"
+            statement_info.match_status = "Regex Match (Review)" # Tentative
+            account_found = True
+            logging.debug(f"PNC: Regex found potential account '{statement_info.account_number}', no sensitive match.")
+
+        # 2. Name Extraction & Sensitive Match (skipped once the number confirmed the account)
+        if not sensitive_match_made:
+            potential_fund_name, sensitive_match = self._find_fund(header_lines, header_upper, sensitive_accounts)
+            if sensitive_match:
+                statement_info.account_name = sensitive_match['name']
+                statement_info.match_status = "Success! (Sensitive Name)" # Upgrade/set status
+                fund_found = True
+                if not account_found: 
+                    statement_info.account_number = sensitive_match['number']
+                    account_found = True
+                elif statement_info.account_number != sensitive_match['number']:
+                    logging.warning(f"PNC: Sensitive name '{statement_info.account_name}' num {sensitive_match['number']} != earlier num {statement_info.account_number}. Prioritizing sensitive.")
+                    statement_info.account_number = sensitive_match['number']
+                sensitive_match_made = True # Definitive match for name (and possibly number)
+                logging.info(f"PNC: Confirmed account via sensitive name match: {statement_info.account_name}")
+            elif potential_fund_name:
+                statement_info.account_name = potential_fund_name
+                statement_info.match_status = "Regex Match (Review)"
+                fund_found = True
+                logging.debug(f"PNC: Regex found potential name '{potential_fund_name}', no sensitive match.")
 
-            if sensitive_match_made and date_found: break # Re-check for early exit
+        # 3. Date Extraction
+        parsed_date = self._find_date(header_lines, header_upper)
+        if parsed_date:
+            statement_info.date = parsed_date
+            logging.debug(f"PNC: Found date {parsed_date:%Y-%m-%d}")
 
         # --- Fallback Logic --- 
         if not sensitive_match_made:
@@ -396,7 +563,7 @@ class BerkshireStrategy(BankStrategy):
     def get_bank_name(self) -> str:
         return "Berkshire"
 
-    def extract_info(self, lines: List[str], statement_info: StatementInfo):
+    def extract_info(self, lines: Iterable[str], statement_info: StatementInfo):
         # Initialize
         statement_info.bank_type = self.get_bank_name()
         # Default status, assuming it will need manual review due to being image-based
@@ -408,12 +575,13 @@ class BerkshireStrategy(BankStrategy):
         account_found_by_filename = False
         date_found_by_filename = False
 
+        is_new_statement, filename_last4, filename_date = _berkshire_filename_hints(original_filename)
+
         # 1. Try to get info from filename (heuristic for "NewStatement" format)
-        if "newstatement" in original_filename.lower() or "new_statement" in original_filename.lower():
+        if is_new_statement:
             logging.info(f"Berkshire: Detected NewStatement format from filename: '{original_filename}'.")
-            match = re.search(r'_(\d{4})(?:\\.pdf)?$', original_filename) # Looking for _XXXX.pdf
-            if match:
-                potential_last4 = match.group(1)
+            if filename_last4:
+                potential_last4 = filename_last4
                 sensitive_match = self._find_sensitive_match_by_number(potential_last4, sensitive_accounts)
                 if sensitive_match:
                     statement_info.account_number = sensitive_match['number']
@@ -434,16 +602,12 @@ class BerkshireStrategy(BankStrategy):
         
         # 2. Attempt to parse a date from filename (YYYY-MM-DD or YYYYMMDD)
         # This is a generic heuristic, not specific to NewStatement
-        date_match_filename = re.search(r'(\d{4}[-_]?\d{2}[-_]?\d{2})', original_filename)
-        if date_match_filename:
-            date_str = date_match_filename.group(1).replace('-','').replace('_','')
-            parsed_date = self._parse_date(date_str, ['%Y%m%d'])
-            if parsed_date:
-                statement_info.date = parsed_date
-                date_found_by_filename = True
-                logging.info(f"Berkshire: Extracted date '{parsed_date:%Y-%m-%d}' from filename.")
-        # 3. Log based on text extraction result (passed in `lines`)
-        if not lines or not any(line.strip() for line in lines):
+        if filename_date:
+            statement_info.date = filename_date
+            date_found_by_filename = True
+            logging.info(f"Berkshire: Extracted date '{filename_date:%Y-%m-%d}' from filename.")
+        # 3. Log based on text extraction result (passed in `lines`; any() stops at the first non-blank line)
+        if not any(line.strip() for line in lines):
             logging.warning(f"Berkshire: No text extracted for '{original_filename}'. Expected for image-based PDF. Processing based on filename if possible.")
         else:
             # 
@@ -481,7 +645,7 @@ class BerkshireStrategy(BankStrategy):
         last4 = "XXXX"
         if statement_info.account_number:
              # Clean the number first (remove non-digits)
-             clean_num_str = re.sub(r'\D', '', statement_info.account_number)
+             clean_num_str = statement_info.account_number.translate(_DIGITS_ONLY)
              if len(clean_num_str) >= 4:
                   last4 = clean_num_str[-4:]
 
@@ -509,13 +673,38 @@ class BerkshireStrategy(BankStrategy):
         return os.path.join(self.get_bank_name(), year_month)
 
 
+# --- Cambridge / BankUnited Patterns ---
+
+# Whole text is one name: letters/spaces, whitespace, then name characters (optionally ending LLC/LP/INC).
+# Was r'^([A-Z\s]+\s+[A-Za-z0-9\s-]+(?:LLC|LP|INC)?)$': three overlapping \s quantifiers backtracked
+# quadratically over the joined text on failure. The lookahead checks the "letters, whitespace, more" shape
+# in one linear pass and a single character class captures the rest (the suffix was already covered by it).
+_FULL_TEXT_NAME_PATTERN = re.compile(r'^(?=[A-Z\s]*?[A-Z\s]\s[A-Za-z0-9\s-])([A-Za-z0-9\s-]+)$', re.IGNORECASE)
+
+# --- Cambridge Patterns ---
+
+# Landmark pattern for Cambridge account number (e.g., Account Number XXXXXX-XX)
+_CAMBRIDGE_ACCOUNT_LANDMARK_PATTERN = re.compile(r'^Account(?:\s+Number)?[\s#:]*(\d+-?\d+)\b', re.IGNORECASE | re.MULTILINE)
+_CAMBRIDGE_FUND_PATTERNS = [
+    _FULL_TEXT_NAME_PATTERN, # Generalized ARCTARIS
+    re.compile(r'^([A-Z\s&\d,-]+(?:LLC|LP|INC))\s*\r?$', re.MULTILINE),
+    re.compile(r'^(SUB[- ]?CDE\s+\d+\s+LLC)$', re.IGNORECASE),
+    re.compile(r'(?:Owner|Name)[:\s]+([A-Z\s]+\s+[A-Za-z0-9\s-]+(?:LLC|LP|INC)?)', re.IGNORECASE), # Generalized ARCTARIS
+    re.compile(r'(?:Owner|Name)[:\s]+(SUB[- ]?CDE\s+\d+\s+LLC)', re.IGNORECASE),
+    re.compile(r'^([A-Za-z0-9\s,.\-]+(?:\s+LLC|\s+LP|\s+INC))$', re.IGNORECASE)
+]
+# Any m/d/y date, searched in a small window after the "Statement Period"/"Statement Date" landmark
+_CAMBRIDGE_DATE_PATTERN = re.compile(r'(\d{1,2}/\d{1,2}/\d{2,4})')
+_CAMBRIDGE_DATE_FORMATS = ['%m/%d/%Y', '%m/%d/%y']
+
+
 class CambridgeStrategy(BankStrategy):
     """Strategy for processing Cambridge Savings Bank statements."""
 
     def get_bank_name(self) -> str:
         return "Cambridge"
 
-    def extract_info(self, lines: List[str], statement_info: StatementInfo):
+    def extract_info(self, lines: Iterable[str], statement_info: StatementInfo):
         # Initialize
         statement_info.bank_type = self.get_bank_name()
         statement_info.match_status = "Default_Name" # Initial status
@@ -530,28 +719,14 @@ class CambridgeStrategy(BankStrategy):
         sensitive_name_match: Optional[Dict] = None
         extracted_date: Optional[datetime] = None
 
+        lines = list(itertools.islice(lines, self.HEADER_SCAN_LIMIT)) # Searched more than once below
         full_text = "\n".join(lines) 
         
-        # Define Regex patterns
-        # Landmark pattern for Cambridge account number (e.g., Account Number XXXXXX-XX)
-        account_num_landmark_pattern = re.compile(r'^Account(?:\s+Number)?[\s#:]*(\d+-?\d+)\b', re.IGNORECASE | re.MULTILINE)
-        fund_patterns = [ 
-            re.compile(r'^([A-Z\s]+\s+[A-Za-z0-9\s-]+(?:LLC|LP|INC)?)$', re.IGNORECASE), # Generalized ARCTARIS
-            re.compile(r'^([A-Z\s&\d,-]+(?:LLC|LP|INC))\s*\r?$', re.MULTILINE), 
-            re.compile(r'^(SUB[- ]?CDE\s+\d+\s+LLC)$', re.IGNORECASE), 
-            re.compile(r'(?:Owner|Name)[:\s]+([A-Z\s]+\s+[A-Za-z0-9\s-]+(?:LLC|LP|INC)?)', re.IGNORECASE), # Generalized ARCTARIS
-            re.compile(r'(?:Owner|Name)[:\s]+(SUB[- ]?CDE\s+\d+\s+LLC)', re.IGNORECASE),
-            re.compile(r'^([A-Za-z0-9\s,.\-]+(?:\s+LLC|\s+LP|\s+INC))$', re.IGNORECASE)
-        ]
-        # Date patterns remain the same (landmark search used in Pass 3)
-        generic_date_pattern = re.compile(r'(\d{1,2}/\d{1,2}/\d{2,4})')
-        date_parse_formats = ['%m/%d/%Y', '%m/%d/%y']
-
         logging.debug(f"Cambridge: Starting multi-pass extraction. Sensitive accounts: {len(sensitive_accounts)}")
 
         # --- Pass 1: Find Account Number via Landmark --- 
         logging.debug(f"Cambridge Pass 1: Searching for account number landmark.")
-        num_match = account_num_landmark_pattern.search(full_text)
+        num_match = _CAMBRIDGE_ACCOUNT_LANDMARK_PATTERN.search(full_text)
         if num_match:
             extracted_num_str = num_match.group(1) # Store raw number (with potential dash)
             normalized_extracted_num = extracted_num_str.replace('-', '')
@@ -567,10 +742,10 @@ class CambridgeStrategy(BankStrategy):
 
         # --- Pass 2: Find Account Name --- 
         logging.debug(f"Cambridge Pass 2: Searching for account name.")
-        for pattern in fund_patterns:
+        for pattern in _CAMBRIDGE_FUND_PATTERNS:
             match = pattern.search(full_text) # Search full text
             if match:
-                extracted = match.group(1).strip(); cleaned = re.sub(r'\s+', ' ', extracted).upper()
+                extracted = match.group(1).strip(); cleaned = _WHITESPACE_PATTERN.sub(' ', extracted).upper()
                 if len(cleaned) > 5 and "CAMBRIDGE SAVINGS BANK" not in cleaned and "PAGE" not in cleaned:
                     potential_fund_name = cleaned
                     logging.debug(f"Cambridge Pass 2: Regex found potential name '{potential_fund_name}'.")
@@ -650,15 +825,15 @@ class CambridgeStrategy(BankStrategy):
             if date_found: break
             search_line_lower = line.lower()
             if "statement period" in search_line_lower or "statement date" in search_line_lower:
-                logging.debug(f"Cambridge Date Search: Found landmark on line {i}: '{line.strip()}'")
+                logging.debug("Cambridge Date Search: Found landmark on line %d: '%s'", i, line.strip())
                 window_lines = lines[i : min(i + 3, len(lines))]
                 search_window_text = "\n".join(window_lines)
-                logging.debug(f"Cambridge Date Search: Window text:\n---\n{search_window_text}\n---")
-                possible_dates = generic_date_pattern.findall(search_window_text)
-                logging.debug(f"Cambridge Date Search: Dates found in window: {possible_dates}")
+                logging.debug("Cambridge Date Search: Window text:\n---\n%s\n---", search_window_text)
+                possible_dates = _CAMBRIDGE_DATE_PATTERN.findall(search_window_text)
+                logging.debug("Cambridge Date Search: Dates found in window: %s", possible_dates)
                 parsed_dates = []
                 for date_str in possible_dates:
-                     parsed = self._parse_date(date_str, date_parse_formats)
+                     parsed = self._parse_date(date_str, _CAMBRIDGE_DATE_FORMATS)
                      if parsed:
                           parsed_dates.append(parsed)
                      else:
@@ -668,8 +843,8 @@ class CambridgeStrategy(BankStrategy):
                      logging.debug(f"Cambridge: Found date {extracted_date:%Y-%m-%d} from landmark window search.")
                      date_found = True
                      break 
-            if not date_found:
-             logging.debug("Cambridge Date Search: Landmark search did not find a valid date.")
+        if not date_found:
+            logging.debug("Cambridge Date Search: Landmark search did not find a valid date.")
         # --- End Date Logic --- 
 
         # --- Final Assignment & Fallbacks ---
@@ -707,60 +882,69 @@ class CambridgeStrategy(BankStrategy):
         return os.path.join("Cambridge", year_month)
 
 
+# --- BankUnited Patterns ---
+
+# Pattern for ******1234 format near "Account Number" or "ACCOUNT #"
+_BANKUNITED_MASKED_ACCOUNT_PATTERN = re.compile(r'(?:Account\s+Number|ACCOUNT\s+#)\s*.*?(\*+)(\d{4})\b', re.IGNORECASE)
+# Fallback pattern for potentially full account numbers
+_BANKUNITED_ACCOUNT_FALLBACK_PATTERN = re.compile(r'Account(?: Number)?:?\s*(\d+)\b', re.IGNORECASE)
+_BANKUNITED_FUND_PATTERNS = [
+    _FULL_TEXT_NAME_PATTERN, # Generalized ARCTARIS
+    re.compile(r'^(SUB[- ]?CDE\s+\d+\s+LLC)$', re.IGNORECASE),
+    re.compile(r'^([A-Z\s&\d,-]+(?:LLC|LP|INC))\s*\r?$'),
+    re.compile(r'^([A-Za-z0-9\s,.\-]+(?:\s+LLC|\s+LP|\s+INC))$', re.IGNORECASE)
+]
+# "Month D, YYYY" dates, searched in a small window after the statement period/date landmark
+_BANKUNITED_DATE_PATTERN = re.compile(r"(\w+\s+\d{1,2},\s+\d{4})")
+_BANKUNITED_DATE_FORMATS = ['%B %d, %Y', '%b %d, %Y']
+
+
 class BankUnitedStrategy(BankStrategy):
     """Strategy for processing BankUnited statements."""
 
     def get_bank_name(self) -> str:
         return "BankUnited"
 
-    def extract_info(self, lines: List[str], statement_info: StatementInfo):
+    def extract_info(self, lines: Iterable[str], statement_info: StatementInfo):
         # Initialize
         statement_info.bank_type = self.get_bank_name()
         statement_info.match_status = "Default_Name" # Initial status
         mappings = self.config.get_account_mappings("bankunited_last4")
         sensitive_accounts = self.config.get_sensitive_accounts(self.get_bank_name())
         account_found = False; fund_found = False; date_found = False; sensitive_match_made = False
+        lines = list(itertools.islice(lines, self.HEADER_SCAN_LIMIT)) # Indexed for the date window below
         full_text = "\n".join(lines) # Keep for potential multiline name patterns
 
-        # Define Regex patterns
-        # Pattern for ******1234 format near "Account Number" or "ACCOUNT #"
-        masked_account_pattern = re.compile(r'(?:Account\s+Number|ACCOUNT\s+#)\s*.*?(\*+)(\d{4})\b', re.IGNORECASE)
-        # Fallback pattern for potentially full account numbers
-        account_pattern_fallback = re.compile(r'Account(?: Number)?:?\s*(\d+)\b', re.IGNORECASE)
-        fund_patterns = [
-             re.compile(r'^([A-Z\s]+\s+[A-Za-z0-9\s-]+(?:LLC|LP|INC)?)$', re.IGNORECASE), # Generalized ARCTARIS
-             re.compile(r'^(SUB[- ]?CDE\s+\d+\s+LLC)$', re.IGNORECASE),
-             re.compile(r'^([A-Z\s&\d,-]+(?:LLC|LP|INC))\s*\r?$'),
-             re.compile(r'^([A-Za-z0-9\s,.\-]+(?:\s+LLC|\s+LP|\s+INC))$', re.IGNORECASE)
-        ]
-        # Date logic remains landmark-based from previous successful approach
-        date_only_pattern = re.compile(r"(\w+\s+\d{1,2},\s+\d{4})")
-        bankunited_date_formats = ['%B %d, %Y', '%b %d, %Y']
-
         logging.debug(f"BankUnited: Starting extraction (single-loop). Sensitive accounts: {len(sensitive_accounts)}")
 
         # --- Process lines for Account, Name, Date --- 
+        trace_enabled = logging.getLogger().isEnabledFor(TRACE) # Checked once, not per line
+        name_search_done = False; potential_fund_name = None; sensitive_name_match_entry = None
         for i, line in enumerate(lines):
-            if not line.strip(): continue
+            stripped_line = line.strip() # Stripped once, reused for the empty check and log output
+            if not stripped_line: continue
             # Optimization: Stop if definitive match found for name/fund AND date found
             if sensitive_match_made and date_found: break 
             
-            logging.log(logging.DEBUG - 5 , f"BankUnited Line {i+1}: {line.strip()}")
+            if trace_enabled:
+                logging.log(TRACE, "BankUnited Line %d: %s", i+1, stripped_line)
+            search_line_lower = line.lower() # Shared by the literal pre-checks below
 
             # 1. Attempt Account Number Extraction (Masked first, then Fallback)
-            if not account_found:
+            # Both account patterns require "account", so skip the regexes on lines without it
+            if not account_found and "account" in search_line_lower:
                 potential_num_str = None
                 is_masked = False
-                match_masked = masked_account_pattern.search(line)
+                match_masked = _BANKUNITED_MASKED_ACCOUNT_PATTERN.search(line)
                 if match_masked:
                     potential_num_str = match_masked.group(2) # The 4 digits
                     is_masked = True
-                    logging.debug(f"BankUnited: Masked account pattern found last 4: '{potential_num_str}'")
+                    logging.debug("BankUnited: Masked account pattern found last 4: '%s'", potential_num_str)
                 else:
-                    match_fallback = account_pattern_fallback.search(line)
+                    match_fallback = _BANKUNITED_ACCOUNT_FALLBACK_PATTERN.search(line)
                     if match_fallback:
                         potential_num_str = match_fallback.group(1) # Full number
-                        logging.debug(f"BankUnited: Fallback regex found potential account number: '{potential_num_str}'")
+                        logging.debug("BankUnited: Fallback regex found potential account number: '%s'", potential_num_str)
                 
                 # If any number pattern matched, check sensitive list
                 if potential_num_str:
@@ -779,22 +963,25 @@ class BankUnitedStrategy(BankStrategy):
                             statement_info.account_number = potential_num_str
                         account_found = True
                         statement_info.match_status = "Regex Match (Review)" # Tentative
-                        logging.debug(f"BankUnited: Regex account '{statement_info.account_number}' not sensitive. Status: {statement_info.match_status}")
+                        logging.debug("BankUnited: Regex account '%s' not sensitive. Status: %s", statement_info.account_number, statement_info.match_status)
             
             # 2. Attempt Name Extraction & Validation (Skip if already confirmed by sensitive number)
             if not sensitive_match_made: 
-                potential_fund_name = None
-                # Loop through patterns to find name (using full_text for potential multiline names)
-                for pattern in fund_patterns:
-                    match = pattern.search(full_text)
-                    if match:
-                        extracted = match.group(1).strip(); cleaned = re.sub(r'\s+', ' ', extracted).upper()
-                        if len(cleaned) > 5 and "BANKUNITED" not in cleaned and "PAGE" not in cleaned:
-                            potential_fund_name = cleaned; break
+                # full_text is the same on every line, so the name search and its sensitive check run once, on first use
+                if not name_search_done:
+                    name_search_done = True
+                    # Loop through patterns to find name (using full_text for potential multiline names)
+                    for pattern in _BANKUNITED_FUND_PATTERNS:
+                        match = pattern.search(full_text)
+                        if match:
+                            extracted = match.group(1).strip(); cleaned = _WHITESPACE_PATTERN.sub(' ', extracted).upper()
+                            if len(cleaned) > 5 and "BANKUNITED" not in cleaned and "PAGE" not in cleaned:
+                                potential_fund_name = cleaned; break
+                    if potential_fund_name:
+                        logging.debug("BankUnited: Regex found potential name '%s'. Checking sensitive list (threshold 0.95).", potential_fund_name)
+                        sensitive_name_match_entry = self._find_sensitive_match_by_name(potential_fund_name, sensitive_accounts, threshold=0.95)
+
                 if potential_fund_name:
-                    logging.debug(f"BankUnited: Regex found potential name '{potential_fund_name}'. Checking sensitive list (threshold 0.95).")
-                    sensitive_name_match_entry = self._find_sensitive_match_by_name(potential_fund_name, sensitive_accounts, threshold=0.95)
-                    
                     if sensitive_name_match_entry:
                         # Sensitive name match found! Validate against number found earlier.
                         logging.info(f"BankUnited: Confirmed name via sensitive match: {sensitive_name_match_entry['name']}")
@@ -809,7 +996,7 @@ class BankUnitedStrategy(BankStrategy):
                                 final_status = "Success! (Name & Num Verified)"
                                 # Use the number we extracted from PDF (masked or full)
                                 final_account_number = extracted_num_for_validation 
-                                logging.debug(f"BankUnited: Sensitive name validated: PDF num last4 ({extracted_last4}) matches sensitive last4.")
+                                logging.debug("BankUnited: Sensitive name validated: PDF num last4 (%s) matches sensitive last4.", extracted_last4)
                             else:
                                 final_status = "Warning (Sensitive Name Match, Num Mismatch)"
                                 # Use number from PDF, but flag mismatch
@@ -819,7 +1006,7 @@ class BankUnitedStrategy(BankStrategy):
                             # Sensitive name matched, but couldn't extract any number from PDF
                             final_status = "Success! (Sensitive Name, Num Unverified)"
                             final_account_number = sensitive_name_match_entry['number'] # Use number from sensitive entry
-                            logging.debug(f"BankUnited: Sensitive name matched, but no number found in PDF to verify.")
+                            logging.debug("BankUnited: Sensitive name matched, but no number found in PDF to verify.")
 
                         # Assign validated/unverified info
                         statement_info.account_name = sensitive_name_match_entry['name']
@@ -835,22 +1022,21 @@ class BankUnitedStrategy(BankStrategy):
                         if statement_info.match_status not in ["Success! (Sensitive Number)", "Fallback (Mapping)"]:
                             statement_info.match_status = "Regex Match (Review)" 
                         fund_found = True
-                        logging.debug(f"BankUnited: Regex name '{potential_fund_name}' found, but no sensitive match.")
+                        logging.debug("BankUnited: Regex name '%s' found, but no sensitive match.", potential_fund_name)
 
             # 3. Attempt Date Extraction (Using landmark approach within the loop)
             if not date_found:
                  # ... (Date landmark logic remains the same) ...
-                 search_line_lower = line.lower()
                  if "statement period" in search_line_lower or "statement date" in search_line_lower:
-                     logging.debug(f"BankUnited Date Search: Found landmark on line {i+1}: '{line.strip()}'")
+                     logging.debug("BankUnited Date Search: Found landmark on line %d: '%s'", i+1, stripped_line)
                      window_lines = lines[i : min(i + 3, len(lines))]
                      search_window_text = "\n".join(window_lines)
-                     logging.debug(f"BankUnited Date Search: Window text:\n---\n{search_window_text}\n---")
-                     possible_dates = date_only_pattern.findall(search_window_text)
-                     logging.debug(f"BankUnited Date Search: Dates found in window: {possible_dates}")
+                     logging.debug("BankUnited Date Search: Window text:\n---\n%s\n---", search_window_text)
+                     possible_dates = _BANKUNITED_DATE_PATTERN.findall(search_window_text)
+                     logging.debug("BankUnited Date Search: Dates found in window: %s", possible_dates)
                      parsed_dates = []
                      for date_str in possible_dates:
-                         parsed = self._parse_date(date_str, bankunited_date_formats)
+                         parsed = self._parse_date(date_str, _BANKUNITED_DATE_FORMATS)
                          if parsed:
                              parsed_dates.append(parsed)
                          else:
@@ -942,33 +1128,54 @@ class BankUnitedStrategy(BankStrategy):
         return os.path.join(self.get_bank_name(), year_month)
 
 
+# --- Unlabeled Patterns ---
+
+_UNLABELED_ACCOUNT_PATTERN = re.compile(r'(?:Account|Acct|ACCOUNT|ACCT)[^0-9]*(?:[\dX]+-){0,2}([0-9]{4})\b', re.IGNORECASE)
+_UNLABELED_ACCOUNT_FULL_PATTERN = re.compile(r'(?:Account|Acct|ACCOUNT|ACCT)[^0-9]*(\d{6,})\b', re.IGNORECASE)
+_UNLABELED_DATE_PATTERNS = [
+    re.compile(r'Statement Date[:\s]*(\d{1,2}[/-]\d{1,2}[/-]\d{2,4})', re.I),
+    re.compile(r'Statement Date[:\s]*(\w+\s+\d{1,2},\s+\d{4})', re.I),
+    re.compile(r'Statement Period.*?to\s+(\d{1,2}[/-]\d{1,2}[/-]\d{2,4})', re.I),
+    re.compile(r'Statement Period.*?-\s+(\w+\s+\d{1,2},\s+\d{4})', re.I),
+    re.compile(r'Ending\s+(\d{1,2}/\d{1,2}/\d{2,4})', re.I),
+    re.compile(r'As of\s+(\d{1,2}[/-]\d{1,2}[/-]\d{2,4})', re.I),
+    re.compile(r'Date\s+(\d{1,2}/\d{1,2}/\d{4})\b', re.I),
+    re.compile(r'\b(\d{1,2}/\d{1,2}/\d{4})\b') # Generic date anywhere
+]
+_UNLABELED_DATE_FORMATS = ['%m/%d/%Y', '%m/%d/%y', '%B %d, %Y', '%b %d, %Y', '%Y-%m-%d']
+# Literal prefilters: every account pattern contains "acc" and every date pattern needs a digit,
+# so one cheap check per line stands in for running the whole pattern list on lines that cannot match
+_UNLABELED_ACCOUNT_ANCHOR = 'acc'
+_DIGIT_PATTERN = re.compile(r'\d')
+
+
 class UnlabeledStrategy(BankStrategy):
     """Strategy for processing statements that couldn't be identified by filename or content analysis in PDFProcessor."""
 
     def get_bank_name(self) -> str:
         return "Unlabeled"
 
-    def extract_info(self, lines: List[str], statement_info: StatementInfo):
+    def extract_info(self, lines: Iterable[str], statement_info: StatementInfo):
         # Set bank type to Unlabeled. PDFProcessor already tried to identify it.
         statement_info.bank_type = self.get_bank_name()
         statement_info.match_status = "Unlabeled (Generic Extraction)" # Default status for unlabeled
         logging.info(f"Executing UnlabeledStrategy for '{statement_info.original_filename}'. Attempting generic extraction.")
         
         # Simplified generic extraction - focus on any account number and any date
-        account_pattern = re.compile(r'(?:Account|Acct|ACCOUNT|ACCT)[^0-9]*(?:[\dX]+-){0,2}([0-9]{4})\b', re.IGNORECASE)
-        account_number_full_pattern = re.compile(r'(?:Account|Acct|ACCOUNT|ACCT)[^0-9]*(\d{6,})\b', re.IGNORECASE)
         account_last4 = None; account_number = None; account_found = False
+        lines = list(itertools.islice(lines, self.HEADER_SCAN_LIMIT)) # Scanned twice (account, then date)
         
         for line in lines:
             if account_found: break
-            match = account_number_full_pattern.search(line)
+            if _UNLABELED_ACCOUNT_ANCHOR not in line.lower(): continue # Both patterns need "Account"/"Acct"
+            match = _UNLABELED_ACCOUNT_FULL_PATTERN.search(line)
             if match: 
                 account_number = match.group(1)
                 account_last4 = account_number[-4:]
                 account_found = True
                 logging.debug(f"Unlabeled: Found potential full account ending in {account_last4}"); break
             else: 
-                match = account_pattern.search(line)
+                match = _UNLABELED_ACCOUNT_PATTERN.search(line)
                 if match: 
                     account_last4 = match.group(1)
                     account_found = True
@@ -979,25 +1186,15 @@ class UnlabeledStrategy(BankStrategy):
         elif account_last4: 
             statement_info.account_number = f"xxxx{account_last4}"
         
-        date_patterns = [
-            re.compile(r'Statement Date[:\s]*(\d{1,2}[/-]\d{1,2}[/-]\d{2,4})', re.I), 
-            re.compile(r'Statement Date[:\s]*(\w+\s+\d{1,2},\s+\d{4})', re.I),
-            re.compile(r'Statement Period.*?to\s+(\d{1,2}[/-]\d{1,2}[/-]\d{2,4})', re.I), 
-            re.compile(r'Statement Period.*?-\s+(\w+\s+\d{1,2},\s+\d{4})', re.I),
-            re.compile(r'Ending\s+(\d{1,2}/\d{1,2}/\d{2,4})', re.I), 
-            re.compile(r'As of\s+(\d{1,2}[/-]\d{1,2}[/-]\d{2,4})', re.I),
-            re.compile(r'Date\s+(\d{1,2}/\d{1,2}/\d{4})\b', re.I), 
-            re.compile(r'\b(\d{1,2}/\d{1,2}/\d{4})\b') # Generic date anywhere
-        ]
-        date_formats = ['%m/%d/%Y', '%m/%d/%y', '%B %d, %Y', '%b %d, %Y', '%Y-%m-%d']
         statement_date = None; date_found = False
         
         for line in lines:
             if date_found: break
-            for pattern in date_patterns:
+            if not _DIGIT_PATTERN.search(line): continue # One scan rules the line out for all date patterns
+            for pattern in _UNLABELED_DATE_PATTERNS:
                 match = pattern.search(line)
                 if match:
-                    parsed_date = self._parse_date(match.group(1), date_formats)
+                    parsed_date = self._parse_date(match.group(1), _UNLABELED_DATE_FORMATS)
                     if parsed_date and 2000 <= parsed_date.year <= datetime.now().year + 1:
                          statement_info.date = parsed_date
                          date_found = True
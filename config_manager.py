@@ -1,8 +1,95 @@
 import os
 import json
+import pickle
+import hashlib
 import logging
-from typing import Dict, Any, Optional
-import yaml
+from dataclasses import dataclass, fields
+from typing import Dict, Any, List, Optional, Tuple
+
+try:
+    import orjson # Optional C codec for .json config files; stdlib json is used without it
+except ImportError:
+    orjson = None
+
+# Cached by ConfigManager.get for keys absent from the config, so the caller's default is still returned
+_NOT_FOUND = object()
+
+def _yaml_support():
+    """
+    Imports PyYAML on first use (callers that never read or write YAML don't pay for it) and returns
+    (yaml module, safe loader, dumper), preferring the libyaml bindings PyPI wheels normally ship.
+    """
+    import yaml
+    try:
+        from yaml import CSafeLoader as safe_loader, CDumper as dumper
+    except ImportError:
+        from yaml import SafeLoader as safe_loader, Dumper as dumper
+    return yaml, safe_loader, dumper
+
+def _json_loads(raw: bytes) -> Any:
+    """Parses JSON bytes with orjson when installed. Both codecs raise ValueError subclasses on bad input."""
+    return orjson.loads(raw) if orjson is not None else json.loads(raw)
+
+def _json_dumps(data: Any) -> bytes:
+    """Serializes to indented UTF-8 JSON; non-string keys are stringified by both codecs."""
+    if orjson is not None:
+        return orjson.dumps(data, option=orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS)
+    return json.dumps(data, indent=2).encode('utf-8')
+
+def _json_log_text(data: Any) -> str:
+    """Single-line JSON for log messages. YAML dates come out as ISO strings with either codec."""
+    if orjson is not None:
+        return orjson.dumps(data, option=orjson.OPT_NON_STR_KEYS).decode('utf-8')
+    return json.dumps(data, default=str)
+
+def _is_json_path(file_path: str) -> bool:
+    return file_path.lower().endswith('.json')
+
+@dataclass(frozen=True, slots=True)
+class PatternsConfig:
+    """The 'base_config.patterns' section, with list values stored as tuples."""
+    period_marker: str = "FOR THE PERIOD"
+    stop_markers: Tuple[str, ...] = ("STE",)
+    skip_starters: Tuple[str, ...] = ("Number", "Tax ID", "For Client", "Visit", "For 24-hour", "PNC Bank")
+
+@dataclass(frozen=True, slots=True)
+class BaseConfig:
+    """
+    Read-only snapshot of the 'base_config' section, built once per load so hot paths read attributes
+    instead of resolving dotted keys. Keys missing from the file keep these defaults; unknown keys are ignored
+    (ConfigManager.get still reaches them).
+    """
+    input_folder: str = "input_statements"
+    processed_folder: str = "processed_statements"
+    log_level: str = "INFO"
+    backup_files: bool = True
+    max_workers: int = 1
+    batch_size: int = 20
+    file_verification: bool = True
+    auto_recovery: bool = True
+    check_duplicates: bool = True
+    delete_originals: bool = False
+    preserve_file_metadata: bool = True
+    cache_extractions: bool = False
+    extraction_cache_dir: str = "extraction_cache"
+    overwrite_duplicates_in_output: bool = False
+    pdf_scan_max_pages: int = 10
+    bank_id_min_score: int = 2
+    patterns: PatternsConfig = PatternsConfig()
+
+    @classmethod
+    def from_dict(cls, base_config: Dict[str, Any]) -> "BaseConfig":
+        """Builds from a 'base_config' dict, freezing list values into tuples."""
+        if not isinstance(base_config, dict):
+            return cls()
+        values = {f.name: base_config[f.name] for f in fields(cls) if f.name != "patterns" and f.name in base_config}
+        patterns = base_config.get("patterns")
+        if isinstance(patterns, dict):
+            values["patterns"] = PatternsConfig(**{
+                f.name: tuple(patterns[f.name]) if isinstance(patterns[f.name], list) else patterns[f.name]
+                for f in fields(PatternsConfig) if f.name in patterns
+            })
+        return cls(**values)
 
 class ConfigManager:
     """Manages configuration settings for the application."""
@@ -13,12 +100,17 @@ class ConfigManager:
             "processed_folder": "processed_statements",
             "log_level": "INFO",
             "backup_files": True,
-            "max_workers": 4,
+            "max_workers": 1, # > 1 extracts in worker processes, whose log lines do not reach the run's log file
             "batch_size": 20,
             "file_verification": True,
             "auto_recovery": True,
             "check_duplicates": True,
             "delete_originals": False,
+            "preserve_file_metadata": True, # False: copy file contents only (faster, output gets fresh timestamps)
+            # Opt-in: reuse extraction results for unchanged PDFs across runs. Entries hold the extracted account
+            # names and numbers, so keep extraction_cache_dir somewhere as private as the output folder
+            "cache_extractions": False,
+            "extraction_cache_dir": "extraction_cache",
             "patterns": {
                 "period_marker": "FOR THE PERIOD",
                 "stop_markers": ["STE"],
@@ -39,6 +131,12 @@ class ConfigManager:
         }
     }
 
+    # Parsed main config is pickled here and reused while the YAML file's mtime and size are unchanged
+    CONFIG_CACHE_DIR = os.path.join(os.path.expanduser("~"), ".cache", "bankstmt")
+
+    # Shared instances handed out by instance(), keyed by absolute (config_path, sensitive_config_path)
+    _INSTANCES: Dict[Tuple[str, str], "ConfigManager"] = {}
+
     def __init__(self, config_path: str = "config.yaml", sensitive_config_path: str = "sensitive_accounts.yaml"):
         """
         Initializes the ConfigManager by loading the main config and optionally
@@ -50,8 +148,9 @@ class ConfigManager:
         """
         self.config_path = config_path
         self.sensitive_config_path = sensitive_config_path
-        self.config = self._load_yaml(self.config_path)
-        logging.info(f"Loaded main config from {self.config_path}: {json.dumps(self.config)}")
+        self._get_cache: Dict[str, Any] = {} # Resolved get() lookups by dotted key; cleared by save_config
+        self.config = self._load_yaml_cached(self.config_path)
+        logging.info(f"Loaded main config from {self.config_path}: {_json_log_text(self.config)}")
         self.sensitive_config = self._load_yaml(self.sensitive_config_path)
 
         if self.config is None:
@@ -64,17 +163,51 @@ class ConfigManager:
             self.sensitive_config = {'accounts': {}} # Ensure 'accounts' key exists even if file missing
 
         self._validate_config()
+        # Sensitive accounts validated once: by lower-cased bank key (first key wins on case collisions), and flattened
+        self._sensitive_by_bank, self._sensitive_flat = self._build_sensitive_accounts_index()
+
+    def __getstate__(self):
+        """Pickles (e.g. for pool workers) without the get() cache, whose _NOT_FOUND entries would not survive it."""
+        state = self.__dict__.copy()
+        state["_get_cache"] = {}
+        return state
+
+    @classmethod
+    def instance(cls, config_path: str = "config.yaml", sensitive_config_path: str = "sensitive_accounts.yaml") -> "ConfigManager":
+        """
+        Returns the shared ConfigManager for these paths, constructing (and reading the files) only on first use.
+        Construct ConfigManager directly to force a fresh read.
+        """
+        key = (os.path.abspath(config_path), os.path.abspath(sensitive_config_path))
+        manager = cls._INSTANCES.get(key)
+        if manager is None:
+            manager = cls._INSTANCES[key] = cls(config_path, sensitive_config_path)
+        return manager
 
     def _load_yaml(self, file_path):
-        """Safely loads a YAML file."""
-        if not os.path.exists(file_path):
+        """Safely loads a YAML file (or JSON, for paths ending in .json)."""
+        try:
+            # One read of the whole file; the parser then works from memory instead of pulling small chunks
+            with open(file_path, 'rb') as f:
+                raw = f.read()
+        except FileNotFoundError:
             logging.info(f"Configuration file not found: {file_path}")
             return None
-        try:
-            with open(file_path, 'r') as f:
-                data = yaml.safe_load(f)
-                # Handle empty file case
+        except Exception as e:
+            logging.error(f"Error reading file {file_path}: {e}", exc_info=True)
+            return None
+        if _is_json_path(file_path):
+            try:
+                data = _json_loads(raw)
                 return data if data is not None else {}
+            except ValueError:
+                # save_config used to write YAML whatever the extension, so such files still parse below
+                logging.debug(f"{file_path} is not valid JSON; parsing it as YAML")
+        yaml, safe_loader, _ = _yaml_support()
+        try:
+            data = yaml.load(raw, Loader=safe_loader) # Bytes: PyYAML detects UTF-8/UTF-16 from the BOM
+            # Handle empty file case
+            return data if data is not None else {}
         except yaml.YAMLError as e:
             logging.error(f"Error parsing YAML file {file_path}: {e}", exc_info=True)
             return None
@@ -82,6 +215,41 @@ class ConfigManager:
             logging.error(f"Error reading file {file_path}: {e}", exc_info=True)
             return None
 
+    def _load_yaml_cached(self, file_path):
+        """
+        Loads a YAML file through _load_yaml, reusing a pickled copy of the parsed data from CONFIG_CACHE_DIR
+        while the file's (path, mtime, size) is unchanged. Only used for the main config: sensitive account
+        data is never written to the cache.
+        """
+        try:
+            stat = os.stat(file_path)
+        except OSError:
+            return self._load_yaml(file_path) # Missing/unreadable: let _load_yaml log it
+        cache_key = (os.path.abspath(file_path), stat.st_mtime_ns, stat.st_size)
+        cache_file = os.path.join(self.CONFIG_CACHE_DIR, hashlib.sha1(cache_key[0].encode('utf-8')).hexdigest() + ".pkl")
+        try:
+            with open(cache_file, 'rb') as f:
+                cached_key, data = pickle.load(f)
+            if cached_key == cache_key:
+                logging.debug(f"Loaded parsed config for {file_path} from cache {cache_file}")
+                return data
+        except FileNotFoundError:
+            pass
+        except Exception as e:
+            logging.debug(f"Ignoring unreadable config cache {cache_file}: {e}")
+
+        data = self._load_yaml(file_path)
+        if data is not None:
+            try:
+                os.makedirs(self.CONFIG_CACHE_DIR, exist_ok=True)
+                temp_file = f"{cache_file}.{os.getpid()}.tmp"
+                with open(temp_file, 'wb') as f:
+                    pickle.dump((cache_key, data), f, protocol=pickle.HIGHEST_PROTOCOL)
+                os.replace(temp_file, cache_file) # Atomic, so a concurrent run never reads a partial cache
+            except Exception as e:
+                logging.debug(f"Could not write config cache {cache_file}: {e}")
+        return data
+
     def _validate_config(self):
         """Ensure the loaded config has the expected structure."""
         # Ensure top-level keys exist
@@ -93,46 +261,94 @@ class ConfigManager:
             self.config["account_mappings"] = self.DEFAULT_CONFIG_STRUCTURE["account_mappings"].copy()
 
         # You could add more specific validation here if needed
+        self.base = BaseConfig.from_dict(self.config["base_config"]) # Attribute access for known settings
 
     def _deep_merge(self, source: Dict, destination: Dict) -> Dict:
-        """Deep merge two dictionaries, ensuring destination structure."""
-        for key, value in source.items():
-            if key not in destination:
-                destination[key] = value # Add missing keys from source
-            elif isinstance(value, dict) and isinstance(destination.get(key), dict):
-                # Recursively merge dictionaries
-                self._deep_merge(value, destination[key])
-            # else: destination value takes precedence if types differ or not dict
+        """Deep merge two dictionaries, ensuring destination structure (iterative, so nesting depth is unbounded)."""
+        stack = [(source, destination)]
+        while stack:
+            source_level, destination_level = stack.pop()
+            for key, value in source_level.items():
+                existing = destination_level.get(key, _NOT_FOUND)
+                if existing is _NOT_FOUND:
+                    destination_level[key] = value # Add missing keys from source
+                elif isinstance(value, dict) and isinstance(existing, dict):
+                    stack.append((value, existing)) # Merge nested dictionaries on a later pass
+                # else: destination value takes precedence if types differ or not dict
         return destination
 
     def save_config(self, config_data: Optional[Dict] = None):
         """Save the provided configuration data or the current config to file."""
         data_to_save = config_data if config_data is not None else self.config
+        temp_file = f"{self.config_path}.{os.getpid()}.tmp"
         try:
-            with open(self.config_path, 'w') as f:
-                yaml.dump(data_to_save, f)
+            # Written beside the target and swapped in, so a crash mid-write never leaves a truncated config
+            if _is_json_path(self.config_path):
+                with open(temp_file, 'wb') as f:
+                    f.write(_json_dumps(data_to_save))
+            else:
+                yaml, _, dumper = _yaml_support()
+                with open(temp_file, 'w') as f:
+                    yaml.dump(data_to_save, f, Dumper=dumper)
+            os.replace(temp_file, self.config_path)
             if config_data is None: # Only update internal state if saving current config
                  self.config = data_to_save
+                 self._get_cache.clear() # Config may have been edited in place before saving
+                 self.base = BaseConfig.from_dict(self.config.get("base_config", {}))
         except Exception as e:
             logging.error(f"Error saving config to {self.config_path}: {e}")
+            try: os.remove(temp_file)
+            except OSError: pass
 
     def get(self, key: str, default: Any = None) -> Any:
         """
         Get a configuration value from the 'base_config' section.
         Uses dot notation for nested keys (e.g., 'patterns.period_marker').
+        Each key is resolved once; later calls are a single dict probe.
         """
         try:
-            keys = key.split('.')
+            result = self._get_cache[key]
+        except KeyError:
+            result = self._get_cache[key] = self._resolve_key(key)
+        return default if result is _NOT_FOUND else result
+
+    def _resolve_key(self, key: str) -> Any:
+        """Walks 'base_config' along a dotted key, returning _NOT_FOUND if any part is missing."""
+        try:
             result = self.config.get("base_config", {}) # Start search within base_config
-            for k in keys:
+            for k in key.split('.'):
                 if not isinstance(result, dict): # Check if intermediate key exists and is a dict
-                    return default
+                    return _NOT_FOUND
                 result = result[k] # This will raise KeyError if k is not found
             return result
         except (KeyError, TypeError):
             # Log a warning if a key is accessed but not found? Optional.
             # logging.debug(f"Config key '{key}' not found, returning default.")
-            return default
+            return _NOT_FOUND
+
+    def _build_sensitive_accounts_index(self) -> Tuple[Dict[str, List[Dict]], List[Dict]]:
+        """
+        Validates the sensitive accounts file once, returning ({lower-cased bank key: valid accounts}, all valid accounts).
+        Malformed entries are dropped (and warned about) here instead of on every lookup.
+        """
+        accounts_by_bank = (self.sensitive_config or {}).get('accounts')
+        if not isinstance(accounts_by_bank, dict):
+            return {}, []
+        by_bank: Dict[str, List[Dict]] = {}
+        all_flat: List[Dict] = []
+        for config_bank_key, accounts in accounts_by_bank.items():
+            if not isinstance(accounts, list):
+                valid_accounts = []
+                logging.warning(f"Expected a list of accounts for bank '{config_bank_key}' in '{self.sensitive_config_path}', but found type {type(accounts)}.")
+            else:
+                # Basic validation of list items
+                valid_accounts = [acc for acc in accounts if isinstance(acc, dict) and 'name' in acc and 'number' in acc]
+                if len(valid_accounts) != len(accounts):
+                     logging.warning(f"Some account entries for bank '{config_bank_key}' in '{self.sensitive_config_path}' are malformed.")
+                all_flat.extend(valid_accounts)
+            if isinstance(config_bank_key, str):
+                by_bank.setdefault(config_bank_key.lower(), valid_accounts)
+        return by_bank, all_flat
 
     def get_account_mappings(self, bank_key: str) -> Dict:
         """Get the account mapping dictionary for a specific bank key."""
@@ -154,32 +370,10 @@ class ConfigManager:
             list: A list of account dictionaries (e.g., [{'name': '...', 'number': '...'}]).
                   Returns an empty list if the sensitive config is not loaded,
                   the 'accounts' key is missing, or the bank_key is not found.
+                  The lists are built once at load and shared between calls; treat them as read-only.
         """
-        if not self.sensitive_config or 'accounts' not in self.sensitive_config:
-            return []
-
-        all_bank_accounts_data = self.sensitive_config['accounts']
-
         if bank_key:
-            # Find the bank key case-insensitively
-            for config_bank_key, accounts in all_bank_accounts_data.items():
-                if config_bank_key.lower() == bank_key.lower():
-                    # Ensure the value is a list of dictionaries
-                    if isinstance(accounts, list):
-                        # Basic validation of list items
-                        valid_accounts = [acc for acc in accounts if isinstance(acc, dict) and 'name' in acc and 'number' in acc]
-                        if len(valid_accounts) != len(accounts):
-                             logging.warning(f"Some account entries for bank '{config_bank_key}' in '{self.sensitive_config_path}' are malformed.")
-                        return valid_accounts
-                    else:
-                        logging.warning(f"Expected a list of accounts for bank '{config_bank_key}' in '{self.sensitive_config_path}', but found type {type(accounts)}.")
-                        return []
-            return [] # Bank key not found
-        else:
-            # Return all accounts flattened (less common use case)
-            all_flat = []
-            for bank_accounts in all_bank_accounts_data.values():
-                if isinstance(bank_accounts, list):
-                    valid_accounts = [acc for acc in bank_accounts if isinstance(acc, dict) and 'name' in acc and 'number' in acc]
-                    all_flat.extend(valid_accounts)
-            return all_flat 
\ No newline at end of file
+            # Case-insensitive, validated at load
+            return self._sensitive_by_bank.get(bank_key.lower(), [])
+        # Return all accounts flattened (less common use case)
+        return self._sensitive_flat
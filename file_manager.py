@@ -1,10 +1,15 @@
 # file_manager.py
 import os
+import sys
 import shutil
 import logging
 import csv
+import time
+import threading
+import concurrent.futures
+from collections import namedtuple
 from datetime import datetime
-from typing import List, Dict, Tuple, Set, Optional, Any
+from typing import List, Dict, Tuple, Set, Optional, Any, Callable
 
 # Assuming these are in sibling modules now
 from config_manager import ConfigManager
@@ -12,47 +17,214 @@ from statement_info import StatementInfo
 # We don't need the full strategy here, just the info object processed by it
 # from bank_strategies import BankStrategy # Not strictly needed
 
+# One checklist row, with fields in the CSV's column order so rows go straight to csv.writer
+ChecklistEntry = namedtuple("ChecklistEntry", [
+    "original_file", "original_path",
+    "new_filename", "new_path",
+    "bank_type", "account_name", "account_number", "statement_date",
+    "match_status", "status",
+    "processed_timestamp", "dry_run"
+])
+
 class FileManager:
     """Manages file operations like copying, renaming, and organizing."""
 
+    # Checklist CSV header, one column per ChecklistEntry field
+    CHECKLIST_FIELDNAMES = [
+        "Original File", "Original Path",
+        "New Filename", "New Path",
+        "Bank Type", "Account Name", "Account Number", "Statement Date",
+        "Match Status", "Status",
+        "Processed Timestamp", "Dry Run"
+    ]
+
+    # Per-file progress is logged at DEBUG; INFO gets a progress line every this many files (and at the last one)
+    PROGRESS_LOG_INTERVAL = 10
+
+    # Write buffer for the end-of-run checklist, so a large log goes out in a few big writes (default is 8 KiB)
+    CHECKLIST_WRITE_BUFFER = 64 * 1024
+    # Add 'Verified' if you still intend to use it for manual checks later
+
     def __init__(self, config: ConfigManager):
         """Initialize with configuration."""
         self.config = config
         self._created_folders: Set[str] = set() # Cache for created folders
-        self.processed_files_log: List[Dict[str, Any]] = [] # Log for checklist
+        self._dry_run_folders: Set[str] = set() # Folders a dry run has reported, never checked on disk
+        self.processed_files_log: List[ChecklistEntry] = [] # Log for checklist
+        # Whether each destination folder's filesystem ignores case (see _name_key), probed once per folder
+        self._case_insensitive_folders: Dict[str, bool] = {}
+        # Names (keyed by _name_key) in each destination folder, listed once and kept current as files are copied in
+        self._folder_contents: Dict[str, Set[str]] = {}
+        # (folder, keyed desired name) -> next "(n)" suffix to try, so repeated collisions don't rescan from (1)
+        self._next_counter: Dict[Tuple[str, str], int] = {}
+        # (folder, keyed name) of every destination this manager has copied to; overwrite_duplicates_in_output
+        # only replaces files that were there before, never one written earlier in the same run
+        self._claimed_destinations: Set[Tuple[str, str]] = set()
+        # Guards destination-name selection/reservation and the checklist log when process_batch runs threads
+        self._lock = threading.Lock()
+        # (file, writer, path) of a checklist opened by start_checklist; rows are written as they are logged
+        self._checklist_stream: Optional[Tuple[Any, Any, str]] = None
+        # (whole epoch second, its formatted local time): entries logged within the same second share one strftime
+        self._timestamp_cache: Tuple[int, str] = (-1, "")
 
     def ensure_folder_exists(self, folder_path: str, dry_run: bool = False) -> bool:
         """Ensure the folder exists, creating it if necessary."""
-        if folder_path in self._created_folders or os.path.exists(folder_path):
-            self._created_folders.add(folder_path) # Ensure it's cached
-            return True
         if dry_run:
-            logging.debug(f"Dry Run: Would create folder {folder_path}")
+            # Nothing is created in a dry run, so skip the existence check (slow on synced drives); kept apart from
+            # _created_folders so a later real run on this manager still creates the folder
+            if folder_path not in self._dry_run_folders:
+                self._dry_run_folders.add(folder_path)
+                logging.debug(f"Dry Run: Would create folder {folder_path} (if missing)")
+            return True
+        if folder_path in self._created_folders:
+            return True
+        if os.path.exists(folder_path):
+            self._cache_folder_and_ancestors(folder_path) # Ensure it's cached
             return True
         try:
-            os.makedirs(folder_path, exist_ok=True)
-            self._created_folders.add(folder_path)
+            if os.path.dirname(folder_path) in self._created_folders:
+                os.mkdir(folder_path) # Parent known to exist: skip makedirs' per-ancestor checks
+            else:
+                os.makedirs(folder_path, exist_ok=True)
+            self._cache_folder_and_ancestors(folder_path)
+            self._folder_contents.setdefault(folder_path, set()) # Just created, so empty: no listing needed
             logging.info(f"Created directory: {folder_path}")
             return True
+        except FileExistsError:
+            # Created concurrently (or the cached parent went away and came back): fine if it's a directory
+            if os.path.isdir(folder_path):
+                self._cache_folder_and_ancestors(folder_path)
+                return True
+            logging.error(f"Error creating folder {folder_path}: a file with that name exists")
+            return False
         except Exception as e:
             logging.error(f"Error creating folder {folder_path}: {e}")
             return False
 
-    def _get_non_conflicting_filename(self, dest_folder: str, desired_filename: str) -> str:
-        """Checks if a filename exists and returns a non-conflicting version."""
+    def _move_within_volume(self, source_filepath: str, destination_filepath: str, overwrite: bool = False) -> bool:
+        """
+        Renames source to destination, returning False (nothing moved) when they are on different volumes, the
+        filesystem has no hard links, or it fails. Unless overwrite is set an existing destination is never replaced:
+        the move is a hard link (which fails if the name is taken) then an unlink of the source, and a taken name
+        raises FileExistsError instead of falling back to a copy over it.
+        """
+        try:
+            if overwrite:
+                os.replace(source_filepath, destination_filepath)
+                return True
+            os.link(source_filepath, destination_filepath)
+            try:
+                os.unlink(source_filepath)
+            except OSError:
+                os.unlink(destination_filepath) # Leave only the original, so the copy path starts clean
+                raise
+            return True
+        except FileExistsError:
+            raise
+        except OSError as e:
+            logging.debug(f"Rename of {source_filepath} not possible ({e}); copying instead")
+            return False
+
+    def _cache_folder_and_ancestors(self, folder_path: str):
+        """Records an existing folder and every ancestor of it, stopping at the first ancestor already cached."""
+        while folder_path and folder_path not in self._created_folders:
+            self._created_folders.add(folder_path)
+            parent = os.path.dirname(folder_path)
+            if parent == folder_path: # Reached the filesystem root
+                break
+            folder_path = parent
+
+    def prime_existing_folders(self, base_output_path: str):
+        """
+        Walks base_output_path once with os.scandir, recording every existing folder (and its names, keyed by
+        _name_key) so per-file folder checks and listings for it are cache hits. Symlinked folders are not followed;
+        subfolders take their parent's case sensitivity instead of probing it again.
+        """
+        if not os.path.isdir(base_output_path):
+            return
+        self._cache_folder_and_ancestors(base_output_path)
+        pending = [base_output_path]
+        while pending:
+            folder_path = pending.pop()
+            ignores_case = self._ignores_case(folder_path)
+            name_key = str.casefold if ignores_case else str
+            try:
+                with os.scandir(folder_path) as entries:
+                    names = set()
+                    for entry in entries:
+                        names.add(name_key(entry.name))
+                        if entry.is_dir(follow_symlinks=False):
+                            self._created_folders.add(entry.path)
+                            self._case_insensitive_folders.setdefault(entry.path, ignores_case)
+                            pending.append(entry.path)
+            except OSError as e:
+                logging.warning(f"Could not list output folder {folder_path}: {e}")
+                continue
+            with self._lock:
+                self._folder_contents.setdefault(folder_path, names)
+        logging.debug(f"Primed {len(self._created_folders)} existing folder(s) under {base_output_path}")
+
+    def _ignores_case(self, folder: str) -> bool:
+        """
+        Whether the filesystem holding folder treats 'A.pdf' and 'a.pdf' as the same file (Windows, macOS and
+        OneDrive by default; not Linux). Probed on the nearest existing path component with letters in its name by
+        checking whether its case-swapped spelling is the same file; the platform default if there is none.
+        """
+        ignores_case = self._case_insensitive_folders.get(folder)
+        if ignores_case is None:
+            ignores_case = sys.platform in ("win32", "darwin")
+            path = os.path.abspath(folder)
+            while os.path.dirname(path) != path:
+                name = os.path.basename(path)
+                if name != name.swapcase() and os.path.exists(path):
+                    try:
+                        ignores_case = os.path.samefile(path, os.path.join(os.path.dirname(path), name.swapcase()))
+                    except OSError: # No such spelling, so case matters here
+                        ignores_case = False
+                    break
+                path = os.path.dirname(path)
+            self._case_insensitive_folders[folder] = ignores_case
+        return ignores_case
+
+    def _name_key(self, folder: str) -> Callable[[str], str]:
+        """How names in folder are compared: case-folded where its filesystem ignores case, exactly elsewhere."""
+        return str.casefold if self._ignores_case(folder) else str
+
+    def _folder_listing(self, dest_folder: str) -> Set[str]:
+        """Returns the names in dest_folder (keyed by _name_key), listing it only on first use."""
+        contents = self._folder_contents.get(dest_folder)
+        if contents is None:
+            name_key = self._name_key(dest_folder)
+            try:
+                contents = {name_key(name) for name in os.listdir(dest_folder)}
+            except FileNotFoundError:
+                contents = set() # Not created yet (e.g. dry run)
+            self._folder_contents[dest_folder] = contents
+        return contents
+
+    def _get_non_conflicting_filename(self, dest_folder: str, desired_filename: str, reserve: bool = False) -> str:
+        """
+        Checks if a filename exists and returns a non-conflicting version. With reserve, the name is added to the
+        folder's listing and later calls for the same name resume numbering after it instead of re-testing (1), (2), ...
+        """
         base_name, extension = os.path.splitext(desired_filename)
-        counter = 1
+        contents = self._folder_listing(dest_folder) # One listing per folder instead of a stat per candidate
+        name_key = self._name_key(dest_folder)
+        counter_key = (dest_folder, name_key(desired_filename))
+        counter = self._next_counter.get(counter_key, 1) # Every "(n)" below this is already taken
         final_filename = desired_filename
-        final_path = os.path.join(dest_folder, final_filename)
 
-        while os.path.exists(final_path):
+        while name_key(final_filename) in contents:
             final_filename = f"{base_name} ({counter}){extension}"
-            final_path = os.path.join(dest_folder, final_filename)
             counter += 1
             if counter > 100: # Safety break
                  logging.error(f"Could not find non-conflicting name for {desired_filename} after 100 attempts in {dest_folder}")
                  raise FileExistsError("Too many conflicts finding destination filename.")
 
+        if reserve:
+            contents.add(name_key(final_filename))
+            self._next_counter[counter_key] = counter
+
         if final_filename != desired_filename:
              logging.warning(f"Destination exists. Renaming to: {final_filename}")
 
@@ -104,26 +276,33 @@ class FileManager:
                 self._log_processed_file(source_filepath, "Error", statement_info.bank_type, f"Error (Folder Fail)", dry_run)
                 return False, message
 
-            # 4. Check for filename conflicts
-            final_filename = self._get_non_conflicting_filename(full_output_folder, desired_filename)
+            # 4. Check for filename conflicts (the chosen name is free, so no further exists() check is needed)
+            with self._lock:
+                name_key = self._name_key(full_output_folder)
+                overwrite_existing = (self.config.base.overwrite_duplicates_in_output
+                                      and (full_output_folder, name_key(desired_filename)) not in self._claimed_destinations)
+                if overwrite_existing:
+                    final_filename = desired_filename # Copy over a pre-existing file of that name
+                    if not dry_run:
+                        self._folder_listing(full_output_folder).add(name_key(final_filename))
+                else:
+                    # Reserved now (not on dry runs) so a concurrent process_file can't pick it before this copy lands
+                    final_filename = self._get_non_conflicting_filename(full_output_folder, desired_filename, reserve=not dry_run)
+                if not dry_run:
+                    self._claimed_destinations.add((full_output_folder, name_key(final_filename)))
             destination_filepath = os.path.join(full_output_folder, final_filename)
-            relative_destination = os.path.join(relative_subfolder, final_filename).replace('\\\\', '/') # For logging and consistency
-
-            # Prepare log details (even if dry run or error, to capture intent)
-            log_account_name = statement_info.account_name
-            log_account_number = statement_info.account_number
-            log_statement_date = statement_info.date.strftime("%Y-%m-%d") if statement_info.date else "N/A"
-            log_match_status = statement_info.match_status # Get from statement_info
+            relative_destination = os.path.join(relative_subfolder, final_filename) # For logging and consistency
+            if os.sep != '/':
+                relative_destination = relative_destination.replace(os.sep, '/') # Forward slashes on every OS; no scan on POSIX
 
-            # --- ADD DEBUG LOGGING HERE ---
-            logging.debug(f"FileManager.process_file - Logging for {original_filename}: Name='{log_account_name}', Num='{log_account_number}', Date='{log_statement_date}', MatchStatus='{log_match_status}'")
+            # --- ADD DEBUG LOGGING HERE --- (details only gathered, incl. the date strftime, when debug is on)
+            if logging.getLogger().isEnabledFor(logging.DEBUG):
+                log_statement_date = statement_info.date.date().isoformat() if statement_info.date else "N/A"
+                logging.debug("FileManager.process_file - Logging for %s: Name='%s', Num='%s', Date='%s', MatchStatus='%s'",
+                              original_filename, statement_info.account_name, statement_info.account_number,
+                              log_statement_date, statement_info.match_status)
             # --- END DEBUG LOGGING ---
 
-            if os.path.exists(destination_filepath) and not self.config.get("overwrite_duplicates_in_output", False):
-                message = f"skip processing {original_filename}: Destination file already exists and overwrite is disabled: {destination_filepath}"
-                self._log_processed_file(source_filepath, "Error", statement_info.bank_type, f"Error (Duplicate)", dry_run)
-                return False, message # Return message string on failure
-
             # 5. Perform action (copy/move or log)
             if dry_run:
                 status = "Would Process"
@@ -140,13 +319,24 @@ class FileManager:
                 }
             else:
                 try:
-                    # Use copy2 to preserve metadata
-                    shutil.copy2(source_filepath, destination_filepath)
+                    # The original is not kept, so on the same volume a rename (metadata only, keeps timestamps) does it
+                    if self.config.base.delete_originals and self._move_within_volume(source_filepath, destination_filepath, overwrite_existing):
+                        message = f"Moved '{original_filename}' to '{relative_destination}' (Original Deleted)"
+                        logging.info(message)
+                        self._log_processed_file(source_filepath, relative_destination, statement_info.bank_type, "Processed (Original Deleted)", dry_run)
+                        return True, message
+
+                    # copy2 preserves metadata (mtime, permissions); with preserve_file_metadata off, copyfile skips
+                    # the extra copystat calls (both use the OS zero-copy path for the data itself)
+                    if self.config.base.preserve_file_metadata:
+                        shutil.copy2(source_filepath, destination_filepath)
+                    else:
+                        shutil.copyfile(source_filepath, destination_filepath)
                     message = f"Copied '{original_filename}' to '{relative_destination}'"
                     logging.info(message)
 
                     # Delete original if configured
-                    if self.config.get("delete_originals", False):
+                    if self.config.base.delete_originals:
                          try:
                               os.remove(source_filepath)
                               logging.info(f"Deleted original file: {source_filepath}")
@@ -173,63 +363,145 @@ class FileManager:
              self._log_processed_file(source_filepath, "Error", statement_info.bank_type if statement_info else "Unknown", "Error (Unexpected)", dry_run)
              return False, message # Return message string on failure
 
+    def process_batch(self,
+                      jobs: List[Tuple[str, StatementInfo, 'BankStrategy']],
+                      base_output_path: str,
+                      dry_run: bool = False
+                     ) -> List[Tuple[bool, Dict[str, Any] | str | Exception]]:
+        """
+        Runs process_file for each (source_filepath, statement_info, strategy) job, on a thread pool sized by
+        'max_workers' (copies are I/O bound and release the GIL). Results come back in job order; an exception
+        escaping process_file is logged to the checklist and returned as (False, exception), so callers can tell
+        it apart from a failure process_file reported itself.
+        """
+        total = len(jobs)
+
+        def run_job(index: int, job: Tuple[str, StatementInfo, 'BankStrategy']) -> Tuple[bool, Dict[str, Any] | str | Exception]:
+            source_filepath, statement_info, strategy = job
+            if logging.getLogger().isEnabledFor(logging.DEBUG):
+                logging.debug("[%d/%d] Processing: %s", index + 1, total, os.path.basename(source_filepath))
+            if (index + 1) % self.PROGRESS_LOG_INTERVAL == 0 or index + 1 == total:
+                logging.info(f"Processing file {index + 1}/{total}")
+            try:
+                return self.process_file(source_filepath, base_output_path, statement_info, strategy, dry_run)
+            except Exception as e:
+                logging.error(f"Critical error processing {os.path.basename(source_filepath)}: {e}", exc_info=True)
+                self._log_processed_file(source_filepath, "Error", statement_info.bank_type if statement_info else "Unknown", "Error (Critical)", dry_run)
+                return False, e
+
+        max_workers = min(self.config.base.max_workers or 1, total)
+        if max_workers <= 1:
+            return [run_job(index, job) for index, job in enumerate(jobs)]
+        logging.info(f"Processing {total} file(s) using {max_workers} threads")
+        with concurrent.futures.ThreadPoolExecutor(max_workers=max_workers) as executor:
+            return list(executor.map(run_job, range(total), jobs))
+
     def _log_processed_file(self, original_path: str, dest_path: str, bank_type: str, status: str, dry_run: bool,
                             account_name: Optional[str] = "N/A",
                             account_number: Optional[str] = "N/A",
                             statement_date: Optional[str] = "N/A",
                             match_status: Optional[str] = "N/A"):
         """Adds an entry to the internal log for checklist generation."""
-        log_entry = {
-            "Original File": os.path.basename(original_path),
-            "Original Path": original_path,
-            "New Filename": os.path.basename(dest_path) if dest_path and dest_path != "N/A" else "N/A",
-            "New Path": dest_path,
-            "Bank Type": bank_type or "Unknown",
-            "Account Name": account_name or "N/A",
-            "Account Number": account_number or "N/A",
-            "Statement Date": statement_date or "N/A",
-            "Match Status": match_status or "N/A",
-            "Status": status,
-            "Processed Timestamp": datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
-            "Dry Run": dry_run
-        }
-        self.processed_files_log.append(log_entry)
-        logging.debug(f"Logged for checklist: {log_entry}")
+        log_entry = ChecklistEntry(
+            original_file=os.path.basename(original_path),
+            original_path=original_path,
+            new_filename=os.path.basename(dest_path) if dest_path and dest_path != "N/A" else "N/A",
+            new_path=dest_path,
+            bank_type=bank_type or "Unknown",
+            account_name=account_name or "N/A",
+            account_number=account_number or "N/A",
+            statement_date=statement_date or "N/A",
+            match_status=match_status or "N/A",
+            status=status,
+            processed_timestamp=self._current_timestamp(),
+            dry_run=dry_run
+        )
+        with self._lock:
+            self.processed_files_log.append(log_entry)
+            if self._checklist_stream is not None:
+                try:
+                    self._checklist_stream[1].writerow(log_entry)
+                    self._checklist_stream[0].flush() # On disk now, so a crash mid-run keeps every row so far
+                except Exception as e:
+                    logging.error(f"Error writing checklist row to {self._checklist_stream[2]}: {e}")
+        logging.debug("Logged for checklist: %s", log_entry) # Entry only formatted when debug is on
 
-    def generate_checklist(self, checklist_dir: Optional[str], dry_run: bool) -> Optional[str]:
-        """Generates a CSV checklist of all processed files."""
-        if not self.processed_files_log:
-            logging.info("No files were processed or logged. Checklist not generated.")
-            return None
-        
+    def _current_timestamp(self) -> str:
+        """Local time as 'YYYY-MM-DD HH:MM:SS', formatted once per wall-clock second."""
+        second = int(time.time())
+        cached_second, formatted = self._timestamp_cache
+        if second != cached_second:
+            formatted = time.strftime("%Y-%m-%d %H:%M:%S", time.localtime(second))
+            self._timestamp_cache = (second, formatted) # Single assignment, so threads never see a torn pair
+        return formatted
+
+    def _new_checklist_path(self, checklist_dir: Optional[str], dry_run: bool) -> Optional[str]:
+        """Returns a fresh timestamped checklist path in checklist_dir (created if needed), or None if it can't be."""
         if not checklist_dir:
             checklist_dir = os.path.join(os.getcwd(), "checklists") 
             logging.info(f"Checklist directory not specified, defaulting to: {checklist_dir}")
 
-        self._ensure_dir(checklist_dir)
+        if not self.ensure_folder_exists(checklist_dir):
+            return None
         
         timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
         prefix = "DRYRUN_" if dry_run else ""
         checklist_filename = f"{prefix}processing_checklist_{timestamp}.csv"
-        checklist_filepath = os.path.join(checklist_dir, checklist_filename)
+        return os.path.join(checklist_dir, checklist_filename)
+
+    def start_checklist(self, checklist_dir: Optional[str], dry_run: bool) -> Optional[str]:
+        """
+        Opens a checklist CSV now and streams each entry into it as it is logged (entries already logged are
+        written first), flushing after each row so they reach disk during the run. generate_checklist then closes it and returns its path.
+        Calling it again while a checklist is open keeps streaming to that one.
+        """
+        with self._lock:
+            if self._checklist_stream is not None:
+                return self._checklist_stream[2]
+        checklist_filepath = self._new_checklist_path(checklist_dir, dry_run)
+        if not checklist_filepath:
+            return None
+        try:
+            csvfile = open(checklist_filepath, 'w', newline='', encoding='utf-8')
+            writer = csv.writer(csvfile)
+            writer.writerow(self.CHECKLIST_FIELDNAMES)
+            with self._lock:
+                writer.writerows(self.processed_files_log)
+                csvfile.flush()
+                self._checklist_stream = (csvfile, writer, checklist_filepath)
+            logging.info(f"Streaming checklist to: {checklist_filepath}")
+            return checklist_filepath
+        except Exception as e:
+            logging.error(f"Error opening checklist CSV {checklist_filepath}: {e}", exc_info=True)
+            return None
+
+    def generate_checklist(self, checklist_dir: Optional[str], dry_run: bool) -> Optional[str]:
+        """Generates a CSV checklist of all processed files (or finishes the one opened by start_checklist)."""
+        with self._lock:
+            stream, self._checklist_stream = self._checklist_stream, None
+        if stream is not None:
+            csvfile, _, checklist_filepath = stream
+            try:
+                csvfile.close()
+                logging.info(f"Successfully generated checklist: {checklist_filepath}")
+                return checklist_filepath
+            except Exception as e:
+                logging.error(f"Error closing checklist CSV {checklist_filepath}: {e}", exc_info=True)
+                return None
+
+        if not self.processed_files_log:
+            logging.info("No files were processed or logged. Checklist not generated.")
+            return None
+
+        checklist_filepath = self._new_checklist_path(checklist_dir, dry_run)
+        if not checklist_filepath:
+            return None
 
         try:
-            with open(checklist_filepath, 'w', newline='', encoding='utf-8') as csvfile:
-                # Corrected and comprehensive fieldnames list
-                fieldnames = [
-                    "Original File", "Original Path", 
-                    "New Filename", "New Path", 
-                    "Bank Type", "Account Name", "Account Number", "Statement Date", 
-                    "Match Status", "Status", 
-                    "Processed Timestamp", "Dry Run"
-                ]
-                # Add 'Verified' if you still intend to use it for manual checks later
-                # fieldnames.append("Verified") 
-                
-                writer = csv.DictWriter(csvfile, fieldnames=fieldnames, extrasaction='ignore') # extrasaction='ignore' is safer
-                writer.writeheader()
-                for entry in self.processed_files_log:
-                    writer.writerow(entry) # No need to pre-filter keys if using extrasaction='ignore'
+            with open(checklist_filepath, 'w', newline='', encoding='utf-8', buffering=self.CHECKLIST_WRITE_BUFFER) as csvfile:
+                writer = csv.writer(csvfile)
+                writer.writerow(self.CHECKLIST_FIELDNAMES)
+                writer.writerows(self.processed_files_log) # Entries are tuples in column order
             logging.info(f"Successfully generated checklist: {checklist_filepath}")
             return checklist_filepath
         except IOError as e:
@@ -237,4 +509,4 @@ class FileManager:
             return None
         except Exception as e:
             logging.error(f"An unexpected error occurred during checklist generation: {e}", exc_info=True)
-            return None 
\ No newline at end of file
+            return None 
@@ -3,27 +3,33 @@ import os
 import sys
 import time
 import logging
-from typing import List, Dict, Tuple, Any, Optional
-import concurrent.futures # Keep for potential future parallelization
+from typing import List, Dict, Tuple, Any, Optional, TYPE_CHECKING
+import concurrent.futures
 import argparse
 from config_manager import ConfigManager
-from pdf_processor import PDFProcessor
 from file_manager import FileManager
 from utils import setup_logging, parse_arguments, PDFVerifier, ErrorRecovery, EnhancedJSONEncoder
-from bank_strategies import BankStrategy, UnlabeledStrategy
 from statement_info import StatementInfo
 import json
-from collections import defaultdict
+from collections import defaultdict, Counter
 import traceback # Added for detailed exception logging
-import subprocess # Added for dependency check
-import pkg_resources # Added for dependency check
+import re
+
+if TYPE_CHECKING:
+    from bank_strategies import BankStrategy
 
 # --- Dependency Check Logic ---
 # NOTE: Auto-installing dependencies is generally discouraged.
 # It\'s better to use virtual environments and install manually via `pip install -r requirements.txt`
-# This function attempts to check and install if key packages are missing.
+# This function attempts to check and install if key packages are missing. Only runs with --check-deps.
+
+# Distribution name at the start of a requirements line (before any version specifier or comment)
+_REQUIREMENT_NAME_PATTERN = re.compile(r'^([A-Za-z0-9_.-]+)')
+
 def check_and_install_dependencies(requirements_file='requirements.txt'):
     """Checks if required packages are installed and tries to install them if not."""
+    import subprocess # Only needed with --check-deps
+    from importlib.metadata import distribution, PackageNotFoundError # Stdlib; pkg_resources imported all of setuptools
     required = []
     try:
         with open(requirements_file, 'r') as f:
@@ -31,7 +37,7 @@ def check_and_install_dependencies(requirements_file='requirements.txt'):
                 line = line.strip()
                 if line and not line.startswith('#'):
                     # Basic parsing: get package name before version specifiers
-                    match = re.match(r'^([a-zA-Z0-9_-]+)\s*[=<>~!]?.*', line)
+                    match = _REQUIREMENT_NAME_PATTERN.match(line)
                     if match:
                         required.append(match.group(1))
     except FileNotFoundError:
@@ -44,9 +50,9 @@ def check_and_install_dependencies(requirements_file='requirements.txt'):
     missing = []
     for package in required:
         try:
-            pkg_resources.get_distribution(package)
+            distribution(package)
             logging.debug(f"Package '{package}' found.")
-        except pkg_resources.DistributionNotFound:
+        except PackageNotFoundError:
             logging.warning(f"Required package '{package}' not found.")
             missing.append(package)
         except Exception as e:
@@ -84,13 +90,16 @@ class PdfRenamerApp:
         log_file = setup_logging(initial_log_level, self.args.log_file) # Setup logging BEFORE ConfigManager
         logging.info(f"Initial logging setup complete (Level: {initial_log_level}, File: {log_file})")
         # --- Logging Setup Done ---
+
+        if self.args.check_deps:
+            check_and_install_dependencies()
         
         # 2. Initialize Config Manager (NOW its internal logs should be captured)
-        self.config_manager = ConfigManager(self.args.config)
+        self.config_manager = ConfigManager.instance(self.args.config)
 
         # 3. Optionally refine log level based on loaded config 
         # (This might be redundant if initial_log_level is sufficient, but keeps existing logic)
-        final_log_level = self.args.log_level or self.config_manager.get("log_level", "INFO")
+        final_log_level = self.args.log_level or self.config_manager.base.log_level
         if final_log_level != initial_log_level:
              logging.info(f"Adjusting log level based on config/args to: {final_log_level}")
              # Re-getting the logger and setting level might be needed depending on setup_logging implementation
@@ -103,6 +112,8 @@ class PdfRenamerApp:
         # Initialize other core components
         self.pdf_verifier = PDFVerifier()
         self.error_recovery = ErrorRecovery(self.config_manager) # Pass config
+        # Imported here so --help and argument errors don't load pdfplumber/PyMuPDF and the strategies
+        from pdf_processor import PDFProcessor
         self.pdf_processor = PDFProcessor(self.config_manager)
         self.file_manager = FileManager(self.config_manager)
 
@@ -158,17 +169,22 @@ class PdfRenamerApp:
     def _collect_files(self) -> List[str]:
         """Collects and filters initial PDF files from the input folder."""
         try:
-            all_files = [
-                f for f in os.listdir(self.input_folder)
-                if os.path.isfile(os.path.join(self.input_folder, f)) and f.lower().endswith('.pdf')
-            ]
-            # Filter out already repaired files to avoid processing them directly
-            original_files = [f for f in all_files if not f.lower().endswith('.repaired.pdf')]
-            repaired_files_count = len(all_files) - len(original_files)
+            # scandir entries know their type from the directory read, so is_file() needs no stat on most filesystems
+            pdf_files = []
+            repaired_files_count = 0
+            with os.scandir(self.input_folder) as entries:
+                for entry in entries:
+                    name_lower = entry.name.lower()
+                    if not name_lower.endswith('.pdf') or not entry.is_file():
+                        continue
+                    # Filter out already repaired files to avoid processing them directly
+                    if name_lower.endswith('.repaired.pdf'):
+                        repaired_files_count += 1
+                    else:
+                        pdf_files.append(os.path.join(self.input_folder, entry.name))
             if repaired_files_count > 0:
                  logging.info(f"Ignoring {repaired_files_count} existing '.repaired.pdf' file(s).")
 
-            pdf_files = [os.path.join(self.input_folder, f) for f in original_files]
             logging.info(f"Found {len(pdf_files)} PDF file(s) in input folder.")
             return pdf_files
         except FileNotFoundError:
@@ -184,7 +200,7 @@ class PdfRenamerApp:
 
     def _handle_duplicates(self, pdf_files: List[str]) -> List[str]:
         """Identifies duplicates and filters list if not processing them."""
-        if not self.config_manager.get("check_duplicates", True):
+        if not self.config_manager.base.check_duplicates:
             return pdf_files
 
         logging.info("Checking for duplicate files...")
@@ -214,21 +230,21 @@ class PdfRenamerApp:
 
     def _verify_and_repair_files(self, pdf_files: List[str]) -> List[str]:
         """Verifies files and attempts repair if enabled."""
-        if not self.config_manager.get("file_verification", True):
+        if not self.config_manager.base.file_verification:
             return pdf_files
 
         logging.info("Verifying PDF files...")
         verified_files = []
         failed_verification: List[Tuple[str, str]] = [] # (filepath, message)
 
-        for file_path in pdf_files:
-            is_valid, message = self.pdf_verifier.verify_pdf(file_path)
+        for file_path, (is_valid, message) in zip(pdf_files, self.pdf_verifier.verify_pdfs(pdf_files)):
             if is_valid:
                 verified_files.append(file_path)
             else:
-                logging.warning(f"Verification failed for {os.path.basename(file_path)}: {message}")
+                filename = os.path.basename(file_path)
+                logging.warning(f"Verification failed for {filename}: {message}")
                 failed_verification.append((file_path, message))
-                self.error_recovery.record_error("verification_failed", os.path.basename(file_path))
+                self.error_recovery.record_error("verification_failed", filename)
 
         if not failed_verification:
              logging.info("All files passed verification.")
@@ -237,7 +253,7 @@ class PdfRenamerApp:
         logging.warning(f"{len(failed_verification)} file(s) failed verification.")
 
         # Attempt repair if enabled
-        if self.config_manager.get("auto_recovery", True):
+        if self.config_manager.base.auto_recovery:
             logging.info("Attempting repairs for failed files...")
             repaired_count = 0
             for file_path, reason in failed_verification:
@@ -245,19 +261,21 @@ class PdfRenamerApp:
                  if success and repaired_path:
                       # Verify the *repaired* file before adding it
                       is_repaired_valid, msg = self.pdf_verifier.verify_pdf(repaired_path)
+                      repaired_filename = os.path.basename(repaired_path)
                       if is_repaired_valid:
-                           logging.info(f"Successfully repaired and verified: {os.path.basename(repaired_path)}")
+                           logging.info(f"Successfully repaired and verified: {repaired_filename}")
                            # Replace original with repaired path in the list to process
                            verified_files.append(repaired_path)
                            repaired_count += 1
                            # Should we remove the original bad file now? Configurable?
                            # os.remove(file_path)
                       else:
-                           logging.error(f"Repaired file {os.path.basename(repaired_path)} failed verification: {msg}. Skipping.")
-                           self.error_recovery.record_error("repair_verification_failed", os.path.basename(repaired_path))
+                           logging.error(f"Repaired file {repaired_filename} failed verification: {msg}. Skipping.")
+                           self.error_recovery.record_error("repair_verification_failed", repaired_filename)
                  else:
-                     logging.error(f"Repair failed for {os.path.basename(file_path)}.")
-                     self.error_recovery.record_error("repair_failed", os.path.basename(file_path))
+                     filename = os.path.basename(file_path)
+                     logging.error(f"Repair failed for {filename}.")
+                     self.error_recovery.record_error("repair_failed", filename)
 
             if repaired_count > 0:
                 logging.info(f"Added {repaired_count} successfully repaired file(s) to the processing list.")
@@ -269,18 +287,26 @@ class PdfRenamerApp:
         return verified_files
 
 
-    def _run_preview(self, files_to_process: List[str]):
-        """Runs the processing logic in dry-run mode and gathers results."""
+    def _run_preview(self, files_to_process: List[str],
+                     extraction_results: Optional[List[Tuple[Optional[StatementInfo], Optional['BankStrategy']]]] = None):
+        """
+        Runs the processing logic in dry-run mode and gathers results. extraction_results, if given, are
+        PDFProcessor.process_pdfs results for files_to_process already computed (and their stats merged) by the caller.
+        """
         logging.info("\n=== DRY RUN PREVIEW ===")
         # Store tuples of (original_path, statement_info, strategy, preview_details_dict)
-        preview_data: List[Tuple[str, Optional[StatementInfo], Optional[BankStrategy], Optional[Dict[str, Any]]]] = []
+        preview_data: List[Tuple[str, Optional[StatementInfo], Optional['BankStrategy'], Optional[Dict[str, Any]]]] = []
 
         total_files = len(files_to_process)
-        for i, file_path in enumerate(files_to_process):
+        # Extraction is CPU-bound and independent per file, so run it for the whole batch up front
+        if extraction_results is None:
+            extraction_results, extraction_stats = self.pdf_processor.process_pdfs(files_to_process)
+            self.pdf_processor.merge_extraction_stats(extraction_stats)
+        for i, (file_path, (statement_info, strategy)) in enumerate(zip(files_to_process, extraction_results)):
             filename = os.path.basename(file_path)
-            logging.info(f"[{i+1}/{total_files}] Previewing: {filename}")
-
-            statement_info, strategy = self.pdf_processor.process_pdf(file_path)
+            logging.debug("[%d/%d] Previewing: %s", i + 1, total_files, filename)
+            if (i + 1) % FileManager.PROGRESS_LOG_INTERVAL == 0 or i + 1 == total_files:
+                logging.info(f"Previewing file {i + 1}/{total_files}")
 
             if statement_info and strategy:
                 # Call file manager in dry-run to get structured details
@@ -304,17 +330,18 @@ class PdfRenamerApp:
         # Display detailed preview if requested
         if self.args.show_preview:
             logging.info("\n--- Detailed Preview by Bank ---")
+            # (original filename, destination) pairs per bank; the lines are formatted once when printed
             preview_by_bank = defaultdict(list)
             # Iterate through the updated preview_data structure
-            for _, info, _, details_dict in preview_data:
+            for file_path, info, _, details_dict in preview_data:
                  # Ensure details_dict is not None and contains expected keys
                  if details_dict and isinstance(details_dict, dict):
                      bank_type = details_dict.get('bank_type', 'Unknown')
                      original_file = details_dict.get('original_filename', 'N/A')
                      dest_path = details_dict.get('relative_destination', 'Error')
-                     preview_by_bank[bank_type].append(f"  From: {original_file} -> To: {dest_path}")
+                     preview_by_bank[bank_type].append((original_file, dest_path))
                  elif info: # Fallback if details dict failed but we have info
-                      preview_by_bank[info.bank_type].append(f"  From: {os.path.basename(_)} -> To: Error/Skipped")
+                      preview_by_bank[info.bank_type].append((os.path.basename(file_path), "Error/Skipped"))
                  # else: Skip if no info and no details
 
             if not preview_by_bank:
@@ -323,8 +350,7 @@ class PdfRenamerApp:
                 print(f"PREVIEW_SUMMARY: Found statements from {len(preview_by_bank)} bank type(s).")
                 for bank, files in sorted(preview_by_bank.items()):
                     print(f"BANK_COUNT: {bank} {len(files)}") # Marker for batch file
-                    for file_info in files:
-                         print(file_info)
+                    print("\n".join([f"  From: {original_file} -> To: {dest_path}" for original_file, dest_path in files]))
             print("-" * 30) # End of preview marker for batch
 
         # Generate preview checklist
@@ -341,7 +367,7 @@ class PdfRenamerApp:
         return preview_data
 
 
-    def _run_processing(self, preview_data: List[Tuple[str, Optional[StatementInfo], Optional[BankStrategy], Optional[Dict[str, Any]]]]):
+    def _run_processing(self, preview_data: List[Tuple[str, Optional[StatementInfo], Optional['BankStrategy'], Optional[Dict[str, Any]]]]):
         """Runs the actual file processing based on previewed data."""
         # Filter out entries where preview failed (details_dict is None)
         valid_preview_data = [(fp, info, strat, det) for fp, info, strat, det in preview_data if info and strat and det]
@@ -366,43 +392,14 @@ class PdfRenamerApp:
         # Reset results for actual run
         self.processing_results = {"success": 0, "skipped": 0, "error": 0}
 
-        # --- Optional: Parallel Processing ---
-        # max_workers = self.config_manager.get("max_workers", 1)
-        # if max_workers > 1:
-        #     logging.info(f"Using parallel processing with {max_workers} workers.")
-        #     with concurrent.futures.ThreadPoolExecutor(max_workers=max_workers) as executor:
-        #         futures = [
-        #             executor.submit(self._process_single_file, file_path, info, strategy)
-        #             for file_path, info, strategy, _ in preview_data
-        #         ]
-        #         for future in concurrent.futures.as_completed(futures):
-        #             # Handle results/exceptions if needed, logging is done in the worker
-        #             try: future.result()
-        #             except Exception as exc: logging.error(f"Error in parallel task: {exc}")
-        # else: # Sequential processing
-        #     logging.info("Using sequential processing.")
-        #     for i, (file_path, info, strategy, _) in enumerate(preview_data):
-        #          logging.info(f"[{i+1}/{total_to_process}] Processing: {os.path.basename(file_path)}")
-        #          self._process_single_file(file_path, info, strategy)
-        # --- End Optional Parallel ---
-
-        # --- Start Sequential Processing (Simpler for now) ---
-        logging.info("Using sequential processing.")
-        # The valid_preview_data contains the already instantiated strategy and file info
-        for i, (file_path, info, strategy, details_dict) in enumerate(valid_preview_data):
-            logging.info(f"[{i+1}/{total_to_process}] Processing: {os.path.basename(file_path)}")
-            # We already have the statement_info and strategy from the preview_data tuple
-            # Check info and strategy again just in case, although filtering should handle this
-            if info and strategy:
-                 self._process_single_file(file_path, info, strategy)
-            # else: This case should ideally not happen due to filtering
-
-        # --- End Sequential Processing ---
-
-        # Generate final checklist
-        checklist_path = self.file_manager.generate_checklist(self.checklist_dir, dry_run=False)
-        if checklist_path:
-             print(f"CHECKLIST_PATH: {checklist_path}") # Marker for batch file
+        # FileManager runs the copies on a thread pool sized by 'max_workers' (sequential when it is 1);
+        # results come back in the same order as the jobs
+        jobs = [(file_path, info, strategy) for file_path, info, strategy, _ in valid_preview_data]
+        # Checklist rows go to disk as each file finishes; the first batch opens the file and run() closes it
+        self.file_manager.start_checklist(self.checklist_dir, dry_run=False)
+        results = self.file_manager.process_batch(jobs, self.processed_folder, dry_run=False)
+        for (file_path, _, _), (success, details) in zip(jobs, results):
+            self._record_file_result(file_path, success, critical=isinstance(details, Exception))
 
         logging.info(f"\nProcessing Summary: Success={self.processing_results['success']}, Skipped={self.processing_results['skipped']}, Error={self.processing_results['error']}")
         # Log detailed error summary
@@ -410,14 +407,6 @@ class PdfRenamerApp:
         if error_summary["total_errors_recorded"] > 0:
              logging.info(f"Error Details: {error_summary}")
 
-        # Optionally generate checklist
-        if self.checklist_dir:
-             checklist_path = self.file_manager.generate_checklist(self.checklist_dir, dry_run=self.args.dry_run)
-             if checklist_path:
-                  logging.info(f"Processing checklist generated: {checklist_path}")
-             else:
-                  logging.error("Failed to generate checklist.")
-
         # --- Generate and Display Summary ---
         logging.info("\n" + "=" * 20 + " Processing Summary " + "=" * 20)
         print("\n" + "=" * 20 + " Processing Summary " + "=" * 20)
@@ -434,14 +423,16 @@ class PdfRenamerApp:
         processed_count = 0
         skipped_count = 0
         error_count = 0
-        for log_entry in self.file_manager.processed_files_log:
-            status = log_entry.get("Status", "").lower()
+        # Only a handful of distinct statuses exist, so count them first and classify each one once
+        status_counts = Counter(log_entry.status for log_entry in self.file_manager.processed_files_log)
+        for status, count in status_counts.items():
+            status = status.lower()
             if "processed" in status or "would process" in status:
-                processed_count += 1
+                processed_count += count
             elif "skipped" in status:
-                skipped_count += 1
+                skipped_count += count
             elif "error" in status:
-                error_count += 1
+                error_count += count
             # Add other status checks if needed
 
         summary_lines.append(f"Files processed successfully: {processed_count}")
@@ -466,29 +457,17 @@ class PdfRenamerApp:
         logging.info("PDF Renamer finished.")
 
 
-    def _process_single_file(self, file_path: str, statement_info: StatementInfo, strategy: BankStrategy):
-        """Wrapper to process a single file (used by sequential/parallel execution)."""
-        try:
-            success, message = self.file_manager.process_file(
-                file_path, self.processed_folder, statement_info, strategy, dry_run=False
-            )
-            if success:
-                 self.processing_results["success"] += 1
-            else:
-                 self.processing_results["error"] += 1
-                 self.error_recovery.record_error("file_manager_error", os.path.basename(file_path))
-
-        except Exception as e:
-            logging.error(f"Critical error processing {os.path.basename(file_path)}: {e}", exc_info=True)
-            self.processing_results["error"] += 1
-            self.error_recovery.record_error("critical_processing_error", os.path.basename(file_path))
-            # Ensure it's logged for checklist even on critical failure
-            # Check if already logged by file_manager before adding again
-            is_logged = any(item['Original File'] == os.path.basename(file_path) for item in self.file_manager.processed_files_log)
-            if not is_logged:
-                self.file_manager._log_processed_file(
-                    file_path, "Error", statement_info.bank_type, "Error (Critical)", False
-                )
+    def _record_file_result(self, file_path: str, success: bool, critical: bool = False):
+        """
+        Tallies one FileManager.process_batch result (failures are already logged to the checklist there).
+        critical marks an exception that escaped process_file rather than a failure it reported.
+        """
+        if success:
+             self.processing_results["success"] += 1
+        else:
+             self.processing_results["error"] += 1
+             error_type = "critical_processing_error" if critical else "file_manager_error"
+             self.error_recovery.record_error(error_type, os.path.basename(file_path))
 
     def run(self):
         """Execute the main application workflow."""
@@ -516,28 +495,58 @@ class PdfRenamerApp:
         batch_size = 50
         total_files = len(self.files_to_process)
         logging.info(f"Processing {total_files} files in batches of {batch_size}...")
-
-        # Accumulate overall results across batches
-        overall_preview_data = []
-
-        for i in range(0, total_files, batch_size):
-            batch_files = self.files_to_process[i:min(i + batch_size, total_files)]
-            batch_start_num = i + 1
-            batch_end_num = min(i + batch_size, total_files)
-            logging.info(f"\n--- Processing Batch {batch_start_num}-{batch_end_num}/{total_files} ---")
-
-            # 4. Run Preview for the current batch
-            batch_preview_data = self._run_preview(batch_files)
-            overall_preview_data.extend(batch_preview_data) # Collect for final summary
-
-            # 5. Process Files for the current batch (if not dry run)
+        # One walk of the existing output tree for the whole run, instead of a stat and a listing per destination
+        # folder; later batches see this run's own copies through FileManager's caches
+        self.file_manager.prime_existing_folders(self.processed_folder)
+
+        # Extraction worker processes are started once and reused by every batch.
+        # On a real run the next batch's extraction (CPU-bound) runs on a background thread while the current
+        # batch is copied (I/O-bound). Only process_pdfs runs there, one call at a time; its stats are merged
+        # here once it has been joined. FileManager stays on this thread.
+        prefetch = None if self.args.dry_run else concurrent.futures.ThreadPoolExecutor(max_workers=1)
+        next_extraction = None
+        try:
+            for i in range(0, total_files, batch_size):
+                batch_files = self.files_to_process[i:min(i + batch_size, total_files)]
+                batch_start_num = i + 1
+                batch_end_num = min(i + batch_size, total_files)
+                logging.info(f"\n--- Processing Batch {batch_start_num}-{batch_end_num}/{total_files} ---")
+
+                if next_extraction is not None:
+                    extraction_results, extraction_stats = next_extraction.result()
+                else: # First batch (or a dry run): extract here, before any prefetch is started
+                    extraction_results, extraction_stats = self.pdf_processor.process_pdfs(batch_files)
+                self.pdf_processor.merge_extraction_stats(extraction_stats)
+                next_extraction = None
+                if prefetch and i + batch_size < total_files:
+                    next_files = self.files_to_process[i + batch_size:min(i + 2 * batch_size, total_files)]
+                    next_extraction = prefetch.submit(self.pdf_processor.process_pdfs, next_files)
+
+                # 4. Run Preview for the current batch
+                # Only this batch's preview is kept; the run summary comes from FileManager/PDFProcessor state
+                batch_preview_data = self._run_preview(batch_files, extraction_results)
+
+                # 5. Process Files for the current batch (if not dry run)
+                if not self.args.dry_run:
+                     # Note: Confirmation prompt (if needed) will happen in the first batch
+                     self._run_processing(batch_preview_data)
+
+                logging.info(f"--- Finished Batch {batch_start_num}-{batch_end_num}/{total_files} ---")
+                # Optional: Add a small delay between batches if needed
+                # time.sleep(1) 
+        finally:
+            if prefetch:
+                prefetch.shutdown(wait=True, cancel_futures=True)
+            self.pdf_processor.close()
+            # Generate the checklist once, after all batches; this also closes the one streamed during processing
+            # (opened in the default folder when no checklist dir is set), including when a batch raised
             if not self.args.dry_run:
-                 # Note: Confirmation prompt (if needed) will happen in the first batch
-                 self._run_processing(batch_preview_data)
-
-            logging.info(f"--- Finished Batch {batch_start_num}-{batch_end_num}/{total_files} ---")
-            # Optional: Add a small delay between batches if needed
-            # time.sleep(1) 
+                 checklist_path = self.file_manager.generate_checklist(self.checklist_dir, dry_run=False)
+                 if checklist_path:
+                      logging.info(f"Processing checklist generated: {checklist_path}")
+                      print(f"CHECKLIST_PATH: {checklist_path}") # Marker for batch file
+                 else:
+                      logging.error("Failed to generate checklist.")
 
         # --- End Batch Processing ---
 
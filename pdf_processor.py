@@ -2,10 +2,18 @@
 import os
 # import PyPDF2 # Replaced with pdfplumber
 import pdfplumber # Added
+from pdfminer.pdfparser import PDFSyntaxError # Raised by pdfplumber for malformed files
 import fitz # PyMuPDF
 import re
+import sys
+import json
+import pickle
+import hashlib
+from datetime import datetime
 import logging
-from typing import Tuple, Optional, Dict, Type, List # Added List
+import threading
+import concurrent.futures
+from typing import Tuple, Optional, Dict, Type, List, Iterator # Added List
 from collections import defaultdict
 
 # Assuming these are in sibling modules now
@@ -29,6 +37,10 @@ class PDFProcessor:
         "unlabeled": UnlabeledStrategy # Default/fallback
     }
 
+    # With 'cache_extractions' on, successful extractions are saved as JSON in 'extraction_cache_dir', one file per
+    # (file content, name, config, code) key. Bump the version when StatementInfo or the cached entry changes shape.
+    EXTRACTION_CACHE_VERSION = 2
+
     # Bank indicators for content-based identification (used if filename fails)
     # More comprehensive list now, matching UnlabeledStrategy
     BANK_INDICATORS = {
@@ -54,15 +66,17 @@ class PDFProcessor:
         self.config_manager = config_manager
         self.extraction_stats = defaultdict(int)
         # Cache removed, filename logic simplified below
-        # Dynamically build strategy map from config or use a default
-        self.bank_strategies = {
-            "PNC": PNCStrategy(config_manager),
-            "Berkshire": BerkshireStrategy(config_manager),
-            "BankUnited": BankUnitedStrategy(config_manager),
-            "Cambridge": CambridgeStrategy(config_manager),
-            # "Unlabeled" strategy is handled as a fallback by default
+        # Strategies hold nothing but the config, so one instance per bank key is shared by every file
+        self.bank_strategies: Dict[str, BankStrategy] = {
+            bank_key: strategy_class(config_manager) for bank_key, strategy_class in self.STRATEGY_MAP.items()
         }
-        self.unlabeled_strategy = UnlabeledStrategy(config_manager)
+        self.unlabeled_strategy = self.bank_strategies["unlabeled"] # Fallback for unidentified banks
+        # Worker pool for process_pdfs, started on first use and kept across batches until close()
+        self._executor: Optional[concurrent.futures.ProcessPoolExecutor] = None
+        # Runs in-process extractions for process_pdfs, so they never touch this instance's extraction_stats
+        self._sequential_extractor: Optional['PDFProcessor'] = None
+        self._extract_lock = threading.Lock() # One process_pdfs extraction at a time (pool and extractor setup)
+        self._cache_fingerprint: Optional[bytes] = None # Config/code part of extraction cache keys, built on first use
 
     def _extract_text_with_pdfplumber(self, file_path: str, filename: str) -> Tuple[List[str], bool]:
         """Extracts text from PDF using pdfplumber, returning lines and success status."""
@@ -76,8 +90,8 @@ class PDFProcessor:
                     self.extraction_stats["empty_pdf"] += 1
                     return lines, text_extraction_success # Return empty if no pages
 
-                max_pages_to_scan = min(len(pdf.pages), self.config_manager.get("pdf_scan_max_pages", 10)) # Configurable max pages
-                logging.info(f"Extracting text from up to {max_pages_to_scan} pages in {filename} using pdfplumber")
+                max_pages_to_scan = min(len(pdf.pages), self.config_manager.base.pdf_scan_max_pages) # Configurable max pages
+                logging.debug("Extracting text from up to %d pages in %s using pdfplumber", max_pages_to_scan, filename)
 
                 for i, page in enumerate(pdf.pages):
                     if i >= max_pages_to_scan:
@@ -89,8 +103,9 @@ class PDFProcessor:
                             full_text += page_text + "\n"
                             if not text_extraction_success:
                                 text_extraction_success = True # Mark success on first good page
-                                sample = page_text[:150].replace('\n', ' ') + ("..." if len(page_text) > 150 else "")
-                                logging.info(f"First successful text extraction (page {i+1}, {len(page_text)} chars) from {filename}. Sample: '{sample}'")
+                                if logging.getLogger().isEnabledFor(logging.DEBUG):
+                                    sample = page_text[:150].replace('\n', ' ') + ("..." if len(page_text) > 150 else "")
+                                    logging.debug("First successful text extraction (page %d, %d chars) from %s. Sample: '%s'", i + 1, len(page_text), filename, sample)
                         else:
                              logging.debug(f"No text extracted by pdfplumber from page {i+1} of {filename}")
                     except Exception as page_ex:
@@ -98,12 +113,12 @@ class PDFProcessor:
 
             if text_extraction_success:
                 lines = full_text.splitlines()
-                logging.info(f"pdfplumber successfully extracted {len(full_text)} characters ({len(lines)} lines) from {filename}")
+                logging.debug("pdfplumber successfully extracted %d characters (%d lines) from %s", len(full_text), len(lines), filename)
             else:
                 logging.warning(f"pdfplumber failed to extract any text from {filename}")
                 self.extraction_stats["text_extraction_failed"] += 1
 
-        except pdfplumber.exceptions.PDFSyntaxError as pdf_err:
+        except PDFSyntaxError as pdf_err:
             logging.error(f"Corrupted or invalid PDF for pdfplumber: {filename}. Error: {pdf_err}")
             self.extraction_stats["corrupted_pdf"] += 1
         except PermissionError:
@@ -127,8 +142,8 @@ class PDFProcessor:
                 self.extraction_stats["empty_pdf_pymupdf"] += 1
                 return lines, text_extraction_success
 
-            max_pages_to_scan = min(doc.page_count, self.config_manager.get("pdf_scan_max_pages", 10))
-            logging.info(f"Attempting text extraction with PyMuPDF from up to {max_pages_to_scan} pages in {filename}")
+            max_pages_to_scan = min(doc.page_count, self.config_manager.base.pdf_scan_max_pages)
+            logging.debug("Attempting text extraction with PyMuPDF from up to %d pages in %s", max_pages_to_scan, filename)
 
             for i in range(max_pages_to_scan):
                 page = doc.load_page(i)
@@ -138,8 +153,9 @@ class PDFProcessor:
                         full_text += page_text + "\n"
                         if not text_extraction_success:
                             text_extraction_success = True
-                            sample = page_text[:150].replace('\n', ' ') + ("..." if len(page_text) > 150 else "")
-                            logging.info(f"PyMuPDF: First successful text extraction (page {i+1}, {len(page_text)} chars) from {filename}. Sample: '{sample}'")
+                            if logging.getLogger().isEnabledFor(logging.DEBUG):
+                                sample = page_text[:150].replace('\n', ' ') + ("..." if len(page_text) > 150 else "")
+                                logging.debug("PyMuPDF: First successful text extraction (page %d, %d chars) from %s. Sample: '%s'", i + 1, len(page_text), filename, sample)
                     else:
                         logging.debug(f"No text extracted by PyMuPDF from page {i+1} of {filename}")
                 except Exception as page_ex:
@@ -149,7 +165,7 @@ class PDFProcessor:
 
             if text_extraction_success:
                 lines = full_text.splitlines()
-                logging.info(f"PyMuPDF successfully extracted {len(full_text)} characters ({len(lines)} lines) from {filename}")
+                logging.debug("PyMuPDF successfully extracted %d characters (%d lines) from %s", len(full_text), len(lines), filename)
                 self.extraction_stats["text_extraction_success_pymupdf"] += 1
             else:
                 logging.warning(f"PyMuPDF failed to extract any text from {filename}")
@@ -167,6 +183,48 @@ class PDFProcessor:
             
         return lines, text_extraction_success
 
+    def _iter_text_lines(self, file_path: str, filename: str) -> Iterator[str]:
+        """
+        Lazily yields text lines page by page (pdfplumber, then PyMuPDF if pdfplumber finds no text).
+        Pages past the point where the caller stops iterating are never extracted.
+        """
+        text_found = False
+        read_failed = False # The error handlers below already count the failure
+        try:
+            with pdfplumber.open(file_path) as pdf:
+                max_pages_to_scan = min(len(pdf.pages), self.config_manager.base.pdf_scan_max_pages)
+                for i, page in enumerate(pdf.pages[:max_pages_to_scan]):
+                    try:
+                        page_text = page.extract_text(x_tolerance=2, y_tolerance=2)
+                    except Exception as page_ex:
+                        logging.warning(f"pdfplumber error extracting text from page {i+1} of {filename}: {page_ex}")
+                        continue
+                    if page_text:
+                        text_found = True
+                        # Same line split as joining every page with a trailing newline
+                        yield from (page_text + "\n").splitlines()
+                    else:
+                        logging.debug(f"No text extracted by pdfplumber from page {i+1} of {filename}")
+        except PDFSyntaxError as pdf_err:
+            logging.error(f"Corrupted or invalid PDF for pdfplumber: {filename}. Error: {pdf_err}")
+            self.extraction_stats["corrupted_pdf"] += 1
+            read_failed = True
+        except PermissionError:
+            logging.error(f"Permission denied accessing file for pdfplumber: {file_path}")
+            self.extraction_stats["permission_error"] += 1
+            read_failed = True
+        except Exception as read_ex:
+            logging.error(f"Unexpected error reading PDF with pdfplumber '{filename}': {read_ex}", exc_info=True)
+            self.extraction_stats["read_error"] += 1
+            read_failed = True
+
+        if not text_found:
+            logging.info(f"pdfplumber failed for {filename}. Attempting with PyMuPDF.")
+            if not read_failed: # Same counting as _extract_text_with_pdfplumber: one counter per failure
+                self.extraction_stats["text_extraction_failed"] += 1
+            lines, _ = self._extract_text_with_pymupdf(file_path, filename)
+            yield from lines
+
     def _identify_bank_from_content(self, text_content: str, filename: str) -> Optional[str]:
         """Identifies the most likely bank key based on keywords in text content."""
         if not text_content:
@@ -174,7 +232,7 @@ class PDFProcessor:
 
         text_upper = text_content.upper()
         bank_scores = {bank: 0 for bank in self.BANK_INDICATORS.keys()}
-        min_score_threshold = self.config_manager.get("bank_id_min_score", 2) # Configurable threshold
+        min_score_threshold = self.config_manager.base.bank_id_min_score # Configurable threshold
 
         # Check for all indicators and count occurrences
         for bank, indicators in self.BANK_INDICATORS.items():
@@ -225,36 +283,38 @@ class PDFProcessor:
             # Assign the original filename
             statement_info.original_filename = filename
 
-            # 1. Extract text - Attempt with pdfplumber first
-            extracted_lines, text_extracted_pdfplumber = self._extract_text_with_pdfplumber(file_path, filename)
-            
-            # Convert lines to single string for content identification
-            extracted_text_content = "\n".join(extracted_lines) if extracted_lines else ""
-
-            # 2. Identify Bank Type (preliminary based on filename)
-            # This helps decide if we *need* to try PyMuPDF for specific banks like Berkshire
-            # or if pdfplumber already failed.
+            # 1. Identify Bank Type (preliminary based on filename)
             bank_key_from_filename = self._identify_bank_key_from_filename(filename)
-            
-            # If pdfplumber failed, or if it's a bank known to need OCR (e.g., Berkshire if we configure it so)
-            # For now, let's try PyMuPDF if pdfplumber failed for any file.
-            if not text_extracted_pdfplumber:
-                logging.info(f"pdfplumber failed for {filename}. Attempting with PyMuPDF.")
-                extracted_lines_pymupdf, text_extracted_pymupdf = self._extract_text_with_pymupdf(file_path, filename)
-                if text_extracted_pymupdf:
-                    extracted_lines = extracted_lines_pymupdf # Use PyMuPDF results
-                    extracted_text_content = "\n".join(extracted_lines_pymupdf)
-                    logging.info(f"Successfully switched to PyMuPDF text for {filename}.")
-                else:
-                    logging.warning(f"Both pdfplumber and PyMuPDF failed to extract text from {filename}.")
-            
-            # 3. Identify Bank Type (final determination)
+
             bank_key = None
+            line_stream: Optional[Iterator[str]] = None
             if bank_key_from_filename != "unlabeled":
-                logging.info(f"Preliminary bank identification via filename '{filename}': {bank_key_from_filename}")
+                logging.debug("Preliminary bank identification via filename '%s': %s", filename, bank_key_from_filename)
                 bank_key = bank_key_from_filename
+                # Bank is known, so no content analysis is needed: the strategy pulls lines lazily and
+                # pages it never reads (e.g. past the PNC header block) are never extracted
+                line_stream = self._iter_text_lines(file_path, filename)
+                extracted_lines = line_stream
             else:
-                logging.info(f"Filename did not yield specific bank for '{filename}'. Analyzing content.")
+                # 2. Extract text - Attempt with pdfplumber first
+                extracted_lines, text_extracted_pdfplumber = self._extract_text_with_pdfplumber(file_path, filename)
+
+                # Convert lines to single string for content identification
+                extracted_text_content = "\n".join(extracted_lines) if extracted_lines else ""
+
+                # Try PyMuPDF if pdfplumber failed
+                if not text_extracted_pdfplumber:
+                    logging.info(f"pdfplumber failed for {filename}. Attempting with PyMuPDF.")
+                    extracted_lines_pymupdf, text_extracted_pymupdf = self._extract_text_with_pymupdf(file_path, filename)
+                    if text_extracted_pymupdf:
+                        extracted_lines = extracted_lines_pymupdf # Use PyMuPDF results
+                        extracted_text_content = "\n".join(extracted_lines_pymupdf)
+                        logging.info(f"Successfully switched to PyMuPDF text for {filename}.")
+                    else:
+                        logging.warning(f"Both pdfplumber and PyMuPDF failed to extract text from {filename}.")
+
+                # 3. Identify Bank Type (final determination)
+                logging.debug("Filename did not yield specific bank for '%s'. Analyzing content.", filename)
                 if extracted_text_content: # Check if we have any text (from either method)
                     content_bank_key = self._identify_bank_from_content(extracted_text_content, filename)
                     if content_bank_key:
@@ -265,11 +325,10 @@ class PDFProcessor:
                      logging.warning(f"Cannot perform content analysis for bank ID on {filename} due to complete text extraction failure.")
                      bank_key = "unlabeled"
 
-            logging.info(f"Final determined bank key for {filename}: '{bank_key}'")
-            strategy_class = self.STRATEGY_MAP.get(bank_key, UnlabeledStrategy)
-            strategy = strategy_class(self.config_manager)
+            logging.debug("Final determined bank key for %s: '%s'", filename, bank_key)
+            strategy = self.bank_strategies.get(bank_key, self.unlabeled_strategy)
 
-            if strategy_class is UnlabeledStrategy:
+            if strategy is self.unlabeled_strategy:
                 logging.info(f"File '{filename}' identified as Unlabeled. Skipping further processing and renaming/moving.")
                 self.extraction_stats["unlabeled_identified"] += 1
                 # Return None for StatementInfo, but the strategy instance for potential logging
@@ -299,6 +358,9 @@ class PDFProcessor:
                 # Return strategy instance even on failure for potential logging/reporting
                 # Return None for StatementInfo here to signal failure to FileManager
                 return None, strategy # Modified: Ensure StatementInfo is None on failure
+            finally:
+                if line_stream is not None:
+                    line_stream.close() # Release the PDF if the strategy stopped reading early
 
             # 5. Final Check and Return
             # Consider a successful extraction if bank type is not Unlabeled *and* essential info exists
@@ -311,12 +373,12 @@ class PDFProcessor:
             )
 
             if is_successful:
-                logging.info(f"Extraction successful ({filename}): Bank={statement_info.bank_type}, Account='{statement_info.account_name}', AccNum='{statement_info.account_number}', Date='{statement_info.date.strftime('%Y-%m-%d') if statement_info.date else 'N/A'}'")
+                logging.info(f"Extraction successful ({filename}): Bank={statement_info.bank_type}, Account='{statement_info.account_name}', AccNum='{statement_info.account_number}', Date='{statement_info.date.date().isoformat() if statement_info.date else 'N/A'}'")
                 self.extraction_stats["success"] += 1
                 return statement_info, strategy
             else:
                 log_level = logging.WARNING if statement_info.bank_type != "Unlabeled" else logging.INFO
-                logging.log(log_level, f"Strategy {strategy.__class__.__name__} did not extract sufficient info for {filename}. Result: Bank='{statement_info.bank_type}', Account='{statement_info.account_name}', AccNum='{statement_info.account_number}', Date='{statement_info.date.strftime('%Y-%m-%d') if statement_info.date else 'N/A'}'")
+                logging.log(log_level, f"Strategy {strategy.__class__.__name__} did not extract sufficient info for {filename}. Result: Bank='{statement_info.bank_type}', Account='{statement_info.account_name}', AccNum='{statement_info.account_number}', Date='{statement_info.date.date().isoformat() if statement_info.date else 'N/A'}'")
                 if statement_info.bank_type != "Unlabeled":
                      self.extraction_stats["extraction_failed"] += 1
                 else:
@@ -329,6 +391,178 @@ class PDFProcessor:
             self.extraction_stats["processing_error"] += 1
             return None, None
 
+    def process_pdfs(self, file_paths: List[str]) -> Tuple[List[Tuple[Optional[StatementInfo], Optional[BankStrategy]]], Dict[str, int]]:
+        """
+        Process several PDF files, using a pool of worker processes when 'max_workers' > 1.
+        With 'cache_extractions' on, files whose result is in the extraction cache are not parsed again.
+        Returns ((StatementInfo, BankStrategy) tuples in the same order as file_paths, stats for these files).
+        extraction_stats is left untouched, so this can run on another thread while get_extraction_stats is
+        read; pass the stats to merge_extraction_stats once the call has returned.
+        """
+        batch_stats: Dict[str, int] = defaultdict(int)
+        results: List[Optional[Tuple[Optional[StatementInfo], Optional[str], Dict[str, int]]]] = [None] * len(file_paths)
+        cache_keys: Dict[int, str] = {} # Index -> cache key, for files to store after extraction
+        if self.config_manager.base.cache_extractions:
+            for index, file_path in enumerate(file_paths):
+                cache_key = self._extraction_cache_key(file_path)
+                if cache_key is None:
+                    continue
+                cached = self._load_cached_extraction(cache_key)
+                if cached is not None:
+                    results[index] = cached
+                    batch_stats["extraction_cache_hits"] += 1
+                else:
+                    cache_keys[index] = cache_key
+
+        pending = [index for index, result in enumerate(results) if result is None]
+        if len(pending) < len(file_paths):
+            logging.info(f"Reusing cached extraction results for {len(file_paths) - len(pending)} of {len(file_paths)} PDF(s)")
+        for index, result in zip(pending, self._extract_all([file_paths[index] for index in pending])):
+            results[index] = result
+            statement_info = result[0]
+            if statement_info is not None and index in cache_keys: # Only successful extractions are cached
+                self._store_cached_extraction(cache_keys[index], result)
+
+        processed: List[Tuple[Optional[StatementInfo], Optional[BankStrategy]]] = []
+        for statement_info, bank_key, stats in results:
+            for key, count in stats.items():
+                batch_stats[key] += count
+            processed.append((statement_info, self.bank_strategies.get(bank_key)))
+        return processed, dict(batch_stats)
+
+    def merge_extraction_stats(self, stats: Dict[str, int]):
+        """Adds stats returned by process_pdfs into extraction_stats."""
+        for key, count in stats.items():
+            self.extraction_stats[key] += count
+
+    def _extract_all(self, file_paths: List[str]) -> List[Tuple[Optional[StatementInfo], Optional[str], Dict[str, int]]]:
+        """
+        Runs _extract_one for each file, in the worker pool when worthwhile and otherwise on _sequential_extractor;
+        results are in file_paths order.
+        """
+        with self._extract_lock:
+            return self._extract_all_locked(file_paths)
+
+    def _extract_all_locked(self, file_paths: List[str]) -> List[Tuple[Optional[StatementInfo], Optional[str], Dict[str, int]]]:
+        max_workers = min(self.config_manager.base.max_workers or 1, os.cpu_count() or 1)
+        if max_workers <= 1 or len(file_paths) <= 1:
+            extractor = self._get_sequential_extractor()
+            return [extractor._extract_one(file_path) for file_path in file_paths]
+
+        if self._executor is None:
+            logging.info(f"Starting {max_workers} PDF extraction worker processes")
+            self._executor = concurrent.futures.ProcessPoolExecutor(max_workers=max_workers,
+                                                                    initializer=_init_worker,
+                                                                    initargs=(self.config_manager,))
+        logging.info(f"Extracting {len(file_paths)} PDF(s) using up to {max_workers} worker processes")
+        results: List[Tuple[Optional[StatementInfo], Optional[str], Dict[str, int]]] = []
+        chunksize = max(1, len(file_paths) // (max_workers * 4))
+        # Workers send back the strategy's bank key rather than the pickled strategy (and the config inside it)
+        try:
+            results.extend(self._executor.map(_process_pdf_in_worker, file_paths, chunksize=chunksize))
+        except concurrent.futures.process.BrokenProcessPool as pool_err:
+            # Finish whatever the pool did not get to in this process; the next call starts a fresh pool
+            logging.error(f"Worker pool failed after {len(results)}/{len(file_paths)} file(s): {pool_err}. Continuing sequentially.")
+            self.close()
+            extractor = self._get_sequential_extractor()
+            results.extend(extractor._extract_one(file_path) for file_path in file_paths[len(results):])
+        return results
+
+    def _get_sequential_extractor(self) -> 'PDFProcessor':
+        """The in-process counterpart of a pool worker's PDFProcessor, created on first use."""
+        if self._sequential_extractor is None:
+            self._sequential_extractor = PDFProcessor(self.config_manager)
+        return self._sequential_extractor
+
+    def _extract_one(self, file_path: str) -> Tuple[Optional[StatementInfo], Optional[str], Dict[str, int]]:
+        """
+        Runs process_pdf and returns (StatementInfo, bank key of the strategy used, stats it recorded), leaving
+        extraction_stats as it was. Only called on processors whose stats nobody else reads (a pool worker's or
+        _sequential_extractor), since extraction_stats is swapped out while the file is processed.
+        """
+        own_stats, self.extraction_stats = self.extraction_stats, defaultdict(int)
+        try:
+            statement_info, strategy = self.process_pdf(file_path)
+        finally:
+            file_stats, self.extraction_stats = self.extraction_stats, own_stats
+        bank_key = next((key for key, instance in self.bank_strategies.items() if instance is strategy), None)
+        return statement_info, bank_key, dict(file_stats)
+
+    def _extraction_cache_key(self, file_path: str) -> Optional[str]:
+        """
+        Hash of the file's bytes and name (strategies read both) plus the config and code fingerprint,
+        so any change to those misses the cache. None if the file can't be read.
+        """
+        if self._cache_fingerprint is None:
+            fingerprint = hashlib.blake2b(str(self.EXTRACTION_CACHE_VERSION).encode('ascii'), digest_size=16)
+            # Source of every module a result depends on: this one, the strategies, StatementInfo and config parsing
+            for module_file in (__file__, sys.modules[BankStrategy.__module__].__file__,
+                                sys.modules[StatementInfo.__module__].__file__, sys.modules[ConfigManager.__module__].__file__):
+                with open(module_file, 'rb') as f:
+                    fingerprint.update(f.read())
+            # The loaded configs and the views strategies read from them (BaseConfig with its patterns, sensitive accounts)
+            fingerprint.update(pickle.dumps((self.config_manager.config, self.config_manager.sensitive_config,
+                                             self.config_manager.base, self.config_manager.get_sensitive_accounts()),
+                                            protocol=pickle.HIGHEST_PROTOCOL))
+            self._cache_fingerprint = fingerprint.digest()
+        hasher = hashlib.blake2b(self._cache_fingerprint, digest_size=16)
+        hasher.update(os.path.basename(file_path).encode('utf-8'))
+        try:
+            with open(file_path, 'rb') as f:
+                while True:
+                    chunk = f.read(1024 * 1024)
+                    if not chunk: break
+                    hasher.update(chunk)
+        except OSError as e:
+            logging.debug(f"Not caching extraction for {file_path}: {e}")
+            return None
+        return hasher.hexdigest()
+
+    def _extraction_cache_file(self, cache_key: str) -> str:
+        return os.path.join(self.config_manager.base.extraction_cache_dir, f"{cache_key}.json")
+
+    def _load_cached_extraction(self, cache_key: str) -> Optional[Tuple[Optional[StatementInfo], Optional[str], Dict[str, int]]]:
+        """Reads a cache entry written by _store_cached_extraction; None (a miss) if it is missing or malformed."""
+        cache_file = self._extraction_cache_file(cache_key)
+        try:
+            with open(cache_file, 'r', encoding='utf-8') as f:
+                entry = json.load(f)
+            info = entry["statement_info"]
+            statement_info = StatementInfo(**{name: info[name] for name in StatementInfo.__slots__})
+            if statement_info.date is not None:
+                statement_info.date = datetime.fromisoformat(statement_info.date)
+            bank_key = entry["bank_key"]
+            if bank_key not in self.bank_strategies:
+                raise ValueError(f"unknown bank key {bank_key!r}")
+            return statement_info, bank_key, {str(key): int(count) for key, count in entry["stats"].items()}
+        except FileNotFoundError:
+            return None
+        except Exception as e:
+            logging.debug(f"Ignoring unreadable extraction cache entry {cache_file}: {e}")
+            return None
+
+    def _store_cached_extraction(self, cache_key: str, result: Tuple[Optional[StatementInfo], Optional[str], Dict[str, int]]):
+        """Saves a successful extraction as plain JSON (loading it back never runs code, unlike pickle)."""
+        statement_info, bank_key, stats = result
+        info = {name: getattr(statement_info, name) for name in StatementInfo.__slots__}
+        if statement_info.date is not None:
+            info["date"] = statement_info.date.isoformat()
+        cache_file = self._extraction_cache_file(cache_key)
+        try:
+            os.makedirs(os.path.dirname(cache_file) or ".", exist_ok=True)
+            temp_file = f"{cache_file}.{os.getpid()}.tmp"
+            with open(temp_file, 'w', encoding='utf-8') as f:
+                json.dump({"statement_info": info, "bank_key": bank_key, "stats": stats}, f)
+            os.replace(temp_file, cache_file) # Atomic, so a concurrent run never reads a partial entry
+        except Exception as e:
+            logging.debug(f"Could not write extraction cache entry {cache_file}: {e}")
+
+    def close(self):
+        """Shuts down the worker pool kept by process_pdfs (a later process_pdfs call starts a new one)."""
+        executor, self._executor = self._executor, None
+        if executor is not None:
+            executor.shutdown(wait=True, cancel_futures=True)
+
     def _identify_bank_key_from_filename(self, filename: str) -> str:
         """
         Quickly identify bank type key (lowercase string) from known filename patterns.
@@ -382,4 +616,22 @@ class PDFProcessor:
 
     def get_extraction_stats(self) -> Dict[str, int]:
         """Get statistics about PDF extractions."""
-        return dict(self.extraction_stats) 
\ No newline at end of file
+        return dict(self.extraction_stats)
+
+
+# --- Worker Process Helpers ---
+
+# Each pool worker builds its own PDFProcessor once, so strategies are not rebuilt per file
+_worker_processor: Optional[PDFProcessor] = None
+
+def _init_worker(config_manager: ConfigManager):
+    """Pool initializer: creates the per-process PDFProcessor."""
+    global _worker_processor
+    _worker_processor = PDFProcessor(config_manager)
+
+def _process_pdf_in_worker(file_path: str) -> Tuple[Optional[StatementInfo], Optional[str], Dict[str, int]]:
+    """
+    Runs process_pdf in a worker and returns (StatementInfo, bank key of the strategy used, stats recorded).
+    The parent maps the key back to its own strategy instance.
+    """
+    return _worker_processor._extract_one(file_path)
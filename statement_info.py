@@ -2,9 +2,9 @@ from dataclasses import dataclass, field
 from datetime import datetime
 from typing import Optional
 
-@dataclass
+@dataclass(slots=True)
 class StatementInfo:
-    """Stores extracted information about a bank statement."""
+    """Stores extracted information about a bank statement (slotted: no per-instance __dict__)."""
     original_filename: Optional[str] = None
     bank_type: Optional[str] = None  # e.g., 'PNC', 'Cambridge', 'Unlabeled'
     account_name: Optional[str] = None
@@ -26,6 +26,6 @@ class StatementInfo:
             f"StatementInfo(bank='{self.bank_type}', "
             f"name='{self.account_name}', "
             f"acc_num='{self.account_number}', "
-            f"date='{self.date.strftime('%Y-%m-%d') if self.date else 'None'}', "
+            f"date='{self.date.date().isoformat() if self.date else 'None'}', "
             f"orig_file='{self.original_filename}')"
         ) 
\ No newline at end of file
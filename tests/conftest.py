@@ -0,0 +1,49 @@
+import json
+import os
+import sys
+
+import pytest
+
+# The modules live at the repository root, not in a package
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+
+@pytest.fixture
+def make_pdf(tmp_path):
+    """Writes a one-page PDF with the given text lines and returns its path."""
+    import fitz
+
+    def _make_pdf(filename, lines, folder=None):
+        folder = folder or tmp_path / "in"
+        os.makedirs(folder, exist_ok=True)
+        path = os.path.join(folder, filename)
+        document = fitz.open()
+        page = document.new_page()
+        for i, line in enumerate(lines):
+            page.insert_text((72, 72 + 14 * i), line, fontsize=11)
+        document.save(path)
+        document.close()
+        return path
+
+    return _make_pdf
+
+
+@pytest.fixture
+def make_config(tmp_path, monkeypatch):
+    """
+    Builds a fresh ConfigManager from a base_config dict, with its parse cache kept under tmp_path.
+    sensitive_accounts ({bank key: [{'name', 'number'}, ...]}) is written as the sensitive accounts file.
+    """
+    from config_manager import ConfigManager
+    monkeypatch.setattr(ConfigManager, "CONFIG_CACHE_DIR", str(tmp_path / "config_cache"))
+
+    def _make_config(base_config=None, name="config.json", sensitive_accounts=None, **sections):
+        config_path = tmp_path / name
+        config_path.write_text(json.dumps({"base_config": base_config or {}, **sections}), encoding="utf-8")
+        sensitive_path = tmp_path / "no_sensitive_accounts.yaml"
+        if sensitive_accounts is not None:
+            sensitive_path = tmp_path / "sensitive_accounts.yaml"
+            sensitive_path.write_text(json.dumps({"accounts": sensitive_accounts}), encoding="utf-8") # JSON is valid YAML
+        return ConfigManager(str(config_path), str(sensitive_path))
+
+    return _make_config
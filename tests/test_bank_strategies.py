@@ -0,0 +1,287 @@
+from datetime import datetime
+
+import re
+
+import Levenshtein
+import pytest
+
+from bank_strategies import (BerkshireStrategy, CambridgeStrategy, PNCStrategy, UnlabeledStrategy, _parse_mdy,
+                             _parse_month_name_date, _sensitive_number_index, parse_date)
+from statement_info import StatementInfo
+
+
+def _reference_match(name, accounts, threshold=0.85):
+    """The plain full scan: best Levenshtein ratio over every named account, later equal ratios winning."""
+    best_match = None
+    highest_ratio = threshold
+    for account in accounts:
+        if not account.get('name'):
+            continue
+        ratio = Levenshtein.ratio(name.upper().strip(), account['name'].upper().strip())
+        if ratio >= highest_ratio:
+            highest_ratio = ratio
+            best_match = account
+    return best_match
+
+
+def test_name_match_finds_best_ratio_that_bigram_overlap_ranks_low():
+    strategy = UnlabeledStrategy(None)
+    names = ['HOLDINGS B', 'I HOLDINGS A', 'HOLDINGS ARC', 'MMK LLC LLC IMPACT', 'FUND LLC FUND', 'LP HOLDINGS',
+             'BUFFALO MMK MMK', 'LLC OPERATING II', 'ARC ARC ARC FUND', 'IMPACT LP FUND']
+    accounts = [{'name': name} for name in names]
+    match = strategy._find_sensitive_match_by_name('HOLDINGSAAC', accounts)
+    assert match is not None and match['name'] == 'HOLDINGS ARC'
+    assert match is _reference_match('HOLDINGSAAC', accounts)
+
+
+def test_name_match_tie_goes_to_later_account():
+    strategy = UnlabeledStrategy(None)
+    names = ['FUND LP', 'A HOLDINGS', 'HOLDINGS A', 'ARC BUFFALO FUND LLC', 'OPERATING FUND LLC', 'OPERATING I II II',
+             'BUFFALO IMPACT', 'LLC MMK B TRUST', 'HOLDINGS MMK MMK', 'B HOLDINGS', 'MMK LLC OPERATING', 'I HOLDINGS',
+             'BUFFALO B OPERATING IMPACT']
+    accounts = [{'name': name} for name in names]
+    # 'B HOLDINGS' and 'I HOLDINGS' score the same; the later one in the list is kept
+    match = strategy._find_sensitive_match_by_name('HOLDINGS ', accounts)
+    assert match is not None and match['name'] == 'I HOLDINGS'
+    assert match is _reference_match('HOLDINGS ', accounts)
+
+
+def test_name_match_agrees_with_full_scan():
+    strategy = UnlabeledStrategy(None)
+    names = ['ARC BUFFALO FUND', 'ARC BUFFALO FUND LP', 'ARC BUFALO FUND', 'ARC IMPACT BUFFALO',
+             'BUFFALO ARC FUND', 'ARC BUFFALO FUNDS', 'ARC  BUFFALO FUND', 'ACR BUFFALO FUND', '   ', None]
+    accounts = [{'name': name} for name in names]
+    for query in names[:8] + ['ARC BUFFALO', 'ARC BUFFALO FUND II', 'arc buffalo fund ']:
+        for threshold in (0.85, 0.9, 0.95):
+            assert strategy._find_sensitive_match_by_name(query, accounts, threshold) is \
+                _reference_match(query, accounts, threshold), (query, threshold)
+
+
+def _extract(strategy, lines, filename="statement.pdf"):
+    info = StatementInfo(original_filename=filename)
+    strategy.extract_info(iter(lines), info)
+    return info
+
+
+PNC_HEADER = ["PNC Bank", "JOHN SMITH TRUSTEE", "123 MAIN STREET SUITE 400", "PITTSBURGH PA 15222",
+              "Account Number: 12-3456-7890", "For the Period 04/01/2025 to 04/30/2025", "Visit pnc.com for help"]
+
+
+def test_pnc_header_lines_are_not_account_names(make_config):
+    info = _extract(PNCStrategy(make_config()), PNC_HEADER)
+    assert info.account_number == "1234567890"
+    assert info.account_name == "PNC Account 7890"
+    assert info.match_status == "Fallback (Default)"
+    assert info.date == datetime(2025, 4, 30)
+
+
+@pytest.mark.parametrize("name_line, expected", [
+    ("EAST COAST CDE 12 LLC", "EAST COAST CDE 12 LLC"),
+    ("ACME PRODUCT DEVELOPMENT II", "ACME PRODUCT DEVELOPMENT II"),
+    ("PHASE 2 HOLDINGS", "PHASE 2 HOLDINGS"),
+    ("RIVERSIDE FUND LP", "RIVERSIDE FUND"),
+    ("JOHN SMITH TRUSTEE", "PNC Account 7890"),
+    ("ATTN ACCOUNTS PAYABLE", "PNC Account 7890"),
+])
+def test_pnc_account_name_needs_a_recognised_label(make_config, name_line, expected):
+    lines = ["PNC Bank", name_line, "Account Number: 12-3456-7890", "For the Period 04/01/2025 to 04/30/2025"]
+    assert _extract(PNCStrategy(make_config()), lines).account_name == expected
+
+
+def test_pnc_later_name_candidate_wins_without_sensitive_match(make_config):
+    lines = ["PNC Bank", "EAST COAST CDE 12 LLC", "Account Number: 12-3456-7890", "RIVERSIDE FUND LP",
+             "For the Period 04/01/2025 to 04/30/2025"]
+    info = _extract(PNCStrategy(make_config()), lines)
+    assert (info.account_name, info.match_status) == ("RIVERSIDE FUND", "Regex Match (Review)")
+
+
+def test_pnc_sensitive_name_beats_a_later_candidate(make_config):
+    config = make_config(sensitive_accounts={"PNC": [{"name": "EAST COAST CDE 12 LLC", "number": "5550001111"}]})
+    lines = ["PNC Bank", "EAST COAST CDE 12 LLC", "RIVERSIDE FUND LP"]
+    info = _extract(PNCStrategy(config), lines)
+    assert (info.account_name, info.account_number) == ("EAST COAST CDE 12 LLC", "5550001111")
+    assert info.match_status == "Success! (Sensitive Name)"
+
+
+@pytest.mark.parametrize("account_line, expected", [
+    ("Account Number: 12-3456-7890", "1234567890"),
+    ("Account Number 1234567890", "1234567890"),
+    ("Account Number: XXXXXX7890", "xxxx7890"),
+    ("Account Number: ****-7890", "xxxx7890"),
+])
+def test_pnc_account_number(make_config, account_line, expected):
+    lines = ["PNC Bank", "JOHN SMITH TRUSTEE", account_line]
+    assert _extract(PNCStrategy(make_config()), lines).account_number == expected
+
+
+def test_pnc_sensitive_number_sets_name(make_config):
+    config = make_config(sensitive_accounts={"PNC": [{"name": "EAST COAST CDE 12 LLC", "number": "1234567890"}]})
+    info = _extract(PNCStrategy(config), PNC_HEADER)
+    assert (info.account_name, info.account_number) == ("EAST COAST CDE 12 LLC", "1234567890")
+    assert info.match_status == "Success! (Sensitive Number)"
+
+
+CAMBRIDGE_HEADER = ["Cambridge Savings Bank", "1374 Massachusetts Avenue", "Cambridge, MA 02138",
+                    "Account Number 55501234", "GAMMA HOLDINGS LLC", "Statement Date 3/31/24", "Page 1 of 4"]
+
+
+def test_cambridge_header_lines(make_config):
+    info = _extract(CambridgeStrategy(make_config()), CAMBRIDGE_HEADER)
+    assert info.account_number == "55501234"
+    assert info.account_name == "GAMMA HOLDINGS LLC"
+    assert info.match_status == "Regex Match (Review)"
+    assert info.date == datetime(2024, 3, 31)
+
+
+def test_cambridge_hyphenated_account_number_matches_sensitive(make_config):
+    config = make_config(sensitive_accounts={"Cambridge": [{"name": "GAMMA HOLDINGS LLC", "number": "55501234"}]})
+    lines = [line.replace("55501234", "555012-34") for line in CAMBRIDGE_HEADER]
+    info = _extract(CambridgeStrategy(config), lines)
+    assert (info.account_name, info.account_number) == ("GAMMA HOLDINGS LLC", "55501234")
+    assert info.match_status == "Success! (Sensitive Number)"
+
+
+@pytest.mark.parametrize("filename, number, name, date", [
+    ("NewStatement_4444.pdf", "xxxx4444", "BERKSHIRE ACCOUNT 4444", None),
+    ("NewStatement_2024-03-31_4444.pdf", "xxxx4444", "BERKSHIRE ACCOUNT 4444", datetime(2024, 3, 31)),
+    ("Berkshire 20240331.pdf", None, "BERKSHIRE ACCOUNT XXXX", datetime(2024, 3, 31)),
+])
+def test_berkshire_ignores_header_text(make_config, filename, number, name, date):
+    lines = ["Berkshire Bank", "JOHN SMITH TRUSTEE", "Account Number 9876543210"]
+    info = _extract(BerkshireStrategy(make_config()), lines, filename)
+    assert (info.account_number, info.account_name, info.date) == (number, name, date)
+
+
+def test_berkshire_filename_last4_matches_sensitive(make_config):
+    config = make_config(sensitive_accounts={"Berkshire": [{"name": "EPSILON LLC", "number": "1110004444"}]})
+    info = _extract(BerkshireStrategy(config), ["Berkshire Bank"], "NewStatement_4444.pdf")
+    assert (info.account_name, info.account_number) == ("EPSILON LLC", "1110004444")
+    assert info.match_status == "Success! (Filename Heuristic)"
+
+
+def _strptime_ladder(date_str, formats):
+    """What parse_date did before its fast paths: the first format strptime accepts."""
+    for fmt in formats:
+        try:
+            return datetime.strptime(date_str.strip(), fmt)
+        except ValueError:
+            continue
+    return None
+
+
+MDY_FORMATS = ['%m/%d/%Y', '%m/%d/%y']
+
+
+@pytest.mark.parametrize("date_str, formats, expected", [
+    ("4/30/2025", MDY_FORMATS, datetime(2025, 4, 30)),
+    ("04/05/2025", MDY_FORMATS, datetime(2025, 4, 5)),
+    ("3/31/24", MDY_FORMATS, datetime(2024, 3, 31)),
+    ("2/29/2024", MDY_FORMATS, datetime(2024, 2, 29)),
+    ("2/29/2023", MDY_FORMATS, None),
+    ("12/31/68", MDY_FORMATS, datetime(2068, 12, 31)), # strptime's %y pivot
+    ("1/1/69", MDY_FORMATS, datetime(1969, 1, 1)),
+    ("13/1/2024", MDY_FORMATS, None),
+    ("0/10/2024", MDY_FORMATS, None),
+    ("4/31/2024", MDY_FORMATS, None),
+    ("4/30/2025", ['%m/%d/%y'], None), # Four-digit year without %Y
+    ("4/30/25", ['%m/%d/%Y'], None), # Two-digit year without %y
+    ("004/30/2025", MDY_FORMATS, None),
+    ("4/30/202", MDY_FORMATS, None),
+    ("4/30", MDY_FORMATS, None),
+    ("4/30/2025/1", MDY_FORMATS, None),
+    ("4/+3/2025", MDY_FORMATS, None),
+    (" 4/30/2025 ", MDY_FORMATS, datetime(2025, 4, 30)), # parse_date strips; _parse_mdy gets it stripped
+    ("\uff14/30/2025", MDY_FORMATS, None), # Full-width digit: isdigit() is true, but strptime rejects it too
+])
+def test_mdy_dates_parse_like_strptime(date_str, formats, expected):
+    assert parse_date(date_str, formats) == expected == _strptime_ladder(date_str, formats)
+    fast = _parse_mdy(date_str.strip(), formats)
+    assert fast is None or fast == expected
+
+
+MONTH_NAME_FORMATS = ['%B %d, %Y', '%b %d, %Y']
+
+
+@pytest.mark.parametrize("date_str, formats, expected", [
+    ("April 30, 2024", MONTH_NAME_FORMATS, datetime(2024, 4, 30)),
+    ("Apr 30, 2024", MONTH_NAME_FORMATS, datetime(2024, 4, 30)),
+    ("april 5, 2024", MONTH_NAME_FORMATS, datetime(2024, 4, 5)),
+    ("MARCH 05, 2024", MONTH_NAME_FORMATS, datetime(2024, 3, 5)),
+    ("May 1, 2024", ['%b %d, %Y'], datetime(2024, 5, 1)), # Same name in both tables
+    ("February 29, 2024", MONTH_NAME_FORMATS, datetime(2024, 2, 29)),
+    ("February 29, 2023", MONTH_NAME_FORMATS, None),
+    ("September 31, 2024", MONTH_NAME_FORMATS, None),
+    ("Sept 30, 2024", MONTH_NAME_FORMATS, None),
+    ("April 30, 2024", ['%b %d, %Y'], None), # Full name without %B
+    ("Apr 30, 2024", ['%B %d, %Y'], None), # Abbreviation without %b
+    ("April  30,   2024", MONTH_NAME_FORMATS, datetime(2024, 4, 30)),
+    ("April 30,2024", MONTH_NAME_FORMATS, None),
+    ("April 30 2024", MONTH_NAME_FORMATS, None),
+    ("Apr. 30, 2024", MONTH_NAME_FORMATS, None),
+    ("April 030, 2024", MONTH_NAME_FORMATS, None),
+    ("April 30, 24", MONTH_NAME_FORMATS, None),
+    ("Statement April 30, 2024", MONTH_NAME_FORMATS, None),
+])
+def test_month_name_dates_parse_like_strptime(date_str, formats, expected):
+    assert parse_date(date_str, formats) == expected == _strptime_ladder(date_str, formats)
+    fast = _parse_month_name_date(date_str, formats)
+    assert fast is None or fast == expected
+
+
+def _reference_number_match(number, accounts):
+    """The per-lookup scan the index replaced: first account matching on the full number or, failing that, last 4."""
+    check = re.sub(r'\D', '', number)
+    if not check:
+        return None
+    for account in accounts:
+        sensitive = re.sub(r'\D', '', str(account.get('number') or ''))
+        if not sensitive:
+            continue
+        if check == sensitive:
+            return account
+        if len(check) >= 4 and len(sensitive) >= 4 and check[-4:] == sensitive[-4:]:
+            return account
+    return None
+
+
+NUMBERED_ACCOUNTS = [
+    {'name': 'ALPHA OPERATING', 'number': '12-3456-7890'},
+    {'name': 'ALPHA MMK', 'number': 'xxxx5555'},
+    {'name': 'BETA', 'number': '987654321'},
+    {'name': 'GAMMA', 'number': '555-0004444'},
+    {'name': 'DELTA', 'number': '4444'},
+    {'name': 'NO NUMBER', 'number': None},
+    {'name': 'MASK ONLY', 'number': '****'},
+    {'name': 'SHORT', 'number': '77'},
+    {'name': 'INTEGER', 'number': 1234500001},
+]
+
+
+@pytest.mark.parametrize("number, expected", [
+    ("1234567890", 'ALPHA OPERATING'),
+    ("12-3456-7890", 'ALPHA OPERATING'),
+    ("XXXXXX7890", 'ALPHA OPERATING'),
+    ("****-7890", 'ALPHA OPERATING'),
+    ("******5555", 'ALPHA MMK'),
+    ("1110005555", 'ALPHA MMK'),
+    ("987-654-321", 'BETA'),
+    ("4444", 'GAMMA'), # Last 4 of the earlier account beats DELTA's full match
+    ("xxxx4444", 'GAMMA'),
+    ("77", 'SHORT'),
+    ("7", None),
+    ("777", None),
+    ("****", None),
+    ("", None),
+    ("00001", 'INTEGER'),
+    ("\uff17\uff18\uff19\uff10", None), # Full-width digits survive \D but never equal ASCII ones
+])
+def test_masked_and_hyphenated_account_numbers(number, expected):
+    match = UnlabeledStrategy(None)._find_sensitive_match_by_number(number, NUMBERED_ACCOUNTS)
+    assert (match['name'] if match else None) == expected
+    assert match is _reference_number_match(number, NUMBERED_ACCOUNTS)
+
+
+def test_sensitive_number_index_keeps_the_first_account_per_key():
+    full_index, last4_index = _sensitive_number_index(('12-3456-7890', '', '****', 'xxxx7890', '1234567890', '77'))
+    assert full_index == {'1234567890': 0, '7890': 3, '77': 5}
+    assert last4_index == {'7890': 0}
@@ -0,0 +1,170 @@
+import csv
+import os
+
+import pytest
+
+from file_manager import FileManager
+from statement_info import StatementInfo
+
+
+class _FixedStrategy:
+    """Names every statement the same way, so tests choose the destination."""
+
+    def __init__(self, subfolder="PNC", filename="ACME 7890.pdf"):
+        self.subfolder = subfolder
+        self.filename = filename
+
+    def get_subfolder_path(self, statement_info):
+        return self.subfolder
+
+    def get_filename(self, statement_info):
+        return self.filename
+
+
+def _source(tmp_path, name="Statement_001.pdf", content=b"new"):
+    folder = tmp_path / "in"
+    folder.mkdir(exist_ok=True)
+    path = folder / name
+    path.write_bytes(content)
+    return str(path)
+
+
+def _process(manager, source, output, strategy=None):
+    info = StatementInfo(original_filename=os.path.basename(source), bank_type="PNC")
+    return manager.process_file(source, str(output), info, strategy or _FixedStrategy())
+
+
+def test_move_renames_the_original(tmp_path, make_config):
+    manager = FileManager(make_config({"delete_originals": True}))
+    source = _source(tmp_path)
+    success, _ = _process(manager, source, tmp_path / "out")
+    assert success and not os.path.exists(source)
+    assert (tmp_path / "out" / "PNC" / "ACME 7890.pdf").read_bytes() == b"new"
+
+
+def test_move_never_replaces_a_file_that_appeared_after_listing(tmp_path, make_config):
+    manager = FileManager(make_config({"delete_originals": True}))
+    destination = tmp_path / "out" / "PNC"
+    destination.mkdir(parents=True)
+    manager.prime_existing_folders(str(tmp_path / "out"))
+    (destination / "ACME 7890.pdf").write_bytes(b"existing") # Written by something else after the listing
+    source = _source(tmp_path)
+
+    success, message = _process(manager, source, tmp_path / "out")
+    assert not success and "exists" in message
+    assert (destination / "ACME 7890.pdf").read_bytes() == b"existing"
+    assert os.path.exists(source)
+
+
+def test_move_replaces_a_pre_existing_file_when_overwriting(tmp_path, make_config):
+    manager = FileManager(make_config({"delete_originals": True, "overwrite_duplicates_in_output": True}))
+    destination = tmp_path / "out" / "PNC"
+    destination.mkdir(parents=True)
+    (destination / "ACME 7890.pdf").write_bytes(b"existing")
+    manager.prime_existing_folders(str(tmp_path / "out"))
+    source = _source(tmp_path)
+
+    success, _ = _process(manager, source, tmp_path / "out")
+    assert success and not os.path.exists(source)
+    assert (destination / "ACME 7890.pdf").read_bytes() == b"new"
+
+
+def _checklist_rows(path):
+    with open(path, newline='', encoding='utf-8') as csvfile:
+        return list(csv.reader(csvfile))
+
+
+def test_streamed_checklist_rows_reach_disk_before_close(tmp_path, make_config):
+    manager = FileManager(make_config())
+    path = manager.start_checklist(str(tmp_path / "checklists"), dry_run=False)
+    try:
+        _process(manager, _source(tmp_path), tmp_path / "out")
+        rows = _checklist_rows(path)
+        assert rows[0] == FileManager.CHECKLIST_FIELDNAMES
+        assert [row[0] for row in rows[1:]] == ["Statement_001.pdf"]
+    finally:
+        assert manager.generate_checklist(str(tmp_path / "checklists"), dry_run=False) == path
+
+
+def test_case_variant_names_stay_apart_on_case_sensitive_filesystems(tmp_path, make_config):
+    destination = tmp_path / "out" / "PNC"
+    destination.mkdir(parents=True)
+    (destination / "ACME.pdf").write_bytes(b"existing")
+    manager = FileManager(make_config())
+    assert not manager._ignores_case(str(destination)) # tmp_path is on a case-sensitive Linux filesystem
+
+    success, _ = _process(manager, _source(tmp_path), tmp_path / "out", _FixedStrategy(filename="Acme.pdf"))
+    assert success
+    assert sorted(os.listdir(destination)) == ["ACME.pdf", "Acme.pdf"]
+
+
+def test_case_variant_names_collide_on_case_insensitive_filesystems(tmp_path, make_config, monkeypatch):
+    monkeypatch.setattr(FileManager, "_ignores_case", lambda self, folder: True)
+    destination = tmp_path / "out" / "PNC"
+    destination.mkdir(parents=True)
+    (destination / "ACME.pdf").write_bytes(b"existing")
+    manager = FileManager(make_config())
+
+    success, _ = _process(manager, _source(tmp_path), tmp_path / "out", _FixedStrategy(filename="Acme.pdf"))
+    assert success
+    assert sorted(os.listdir(destination)) == ["ACME.pdf", "Acme (1).pdf"]
+
+
+class _BrokenStrategy(_FixedStrategy):
+    def get_filename(self, statement_info):
+        raise RuntimeError("strategy bug")
+
+
+def _fail_once(log_processed_file):
+    """Wraps _log_processed_file so its first call raises, as a bug past process_file's own handling would."""
+    calls = []
+
+    def wrapper(*args, **kwargs):
+        calls.append(args)
+        if len(calls) == 1:
+            raise RuntimeError("checklist bug")
+        return log_processed_file(*args, **kwargs)
+    return wrapper
+
+
+def test_process_batch_returns_the_exception_for_a_critical_error(tmp_path, make_config, monkeypatch):
+    manager = FileManager(make_config())
+    monkeypatch.setattr(manager, "_log_processed_file", _fail_once(manager._log_processed_file))
+    info = StatementInfo(original_filename="Statement_001.pdf", bank_type="PNC")
+    source = _source(tmp_path)
+    [(success, details)] = manager.process_batch([(source, info, _BrokenStrategy())], str(tmp_path / "out"))
+    assert not success and isinstance(details, RuntimeError)
+    assert [entry.status for entry in manager.processed_files_log] == ["Error (Critical)"]
+
+
+
+@pytest.mark.parametrize("existing, expected", [
+    ([], ["ACME.pdf", "ACME (1).pdf", "ACME (2).pdf"]),
+    (["ACME.pdf"], ["ACME (1).pdf", "ACME (2).pdf", "ACME (3).pdf"]),
+    (["ACME.pdf", "ACME (1).pdf", "ACME (3).pdf"], ["ACME (2).pdf", "ACME (4).pdf", "ACME (5).pdf"]),
+    (["ACME.pdf", "ACME (2).pdf", "ACME (5).pdf"], ["ACME (1).pdf", "ACME (3).pdf", "ACME (4).pdf", "ACME (6).pdf"]),
+    (["ACME (1).pdf"], ["ACME.pdf", "ACME (2).pdf", "ACME (3).pdf"]),
+    (["OTHER.pdf", "ACME (1).pdf.bak"], ["ACME.pdf", "ACME (1).pdf", "ACME (2).pdf"]),
+])
+def test_collision_numbering_fills_gaps_then_continues(tmp_path, make_config, existing, expected):
+    folder = tmp_path / "out"
+    folder.mkdir()
+    for name in existing:
+        (folder / name).write_bytes(b"existing")
+    manager = FileManager(make_config())
+    chosen = [manager._get_non_conflicting_filename(str(folder), "ACME.pdf", reserve=True) for _ in expected]
+    assert chosen == expected
+    # The same as probing the disk from (1) each time, as the copies land
+    for name in chosen:
+        assert not (folder / name).exists()
+        (folder / name).write_bytes(b"new")
+
+
+def test_collision_numbering_without_reserving_does_not_advance(tmp_path, make_config):
+    folder = tmp_path / "out"
+    folder.mkdir()
+    (folder / "ACME.pdf").write_bytes(b"existing")
+    manager = FileManager(make_config())
+    assert [manager._get_non_conflicting_filename(str(folder), "ACME.pdf") for _ in range(2)] == ["ACME (1).pdf"] * 2
+    assert manager._get_non_conflicting_filename(str(folder), "ACME.pdf", reserve=True) == "ACME (1).pdf"
+    assert manager._get_non_conflicting_filename(str(folder), "ACME.pdf", reserve=True) == "ACME (2).pdf"
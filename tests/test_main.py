@@ -0,0 +1,19 @@
+from types import SimpleNamespace
+
+from main import PdfRenamerApp
+from utils import ErrorRecovery
+
+
+def _app():
+    return SimpleNamespace(processing_results={"success": 0, "skipped": 0, "error": 0},
+                           error_recovery=ErrorRecovery(None))
+
+
+def test_record_file_result_keeps_critical_errors_apart():
+    app = _app()
+    PdfRenamerApp._record_file_result(app, "/in/a.pdf", True)
+    PdfRenamerApp._record_file_result(app, "/in/b.pdf", False)
+    PdfRenamerApp._record_file_result(app, "/in/c.pdf", False, critical=True)
+    assert app.processing_results == {"success": 1, "skipped": 0, "error": 2}
+    assert app.error_recovery.get_summary()["error_counts_by_type"] == {
+        "file_manager_error": 1, "critical_processing_error": 1}
@@ -0,0 +1,131 @@
+import concurrent.futures
+import os
+
+from config_manager import BaseConfig
+from pdf_processor import PDFProcessor
+
+STATEMENTS = {
+    "Statement_001.pdf": ["PNC Bank", "Account Number: 12-3456-7890", "For the Period 04/01/2025 to 04/30/2025"],
+    "Online Statements_1.pdf": ["Cambridge Savings Bank", "Account Number 55501234", "GAMMA HOLDINGS LLC",
+                                "Statement Date 3/31/24"],
+    "dxweb_1.pdf": ["BankUnited", "Account Number ******3333", "DELTA FUND LP", "Statement Date: April 30, 2024"],
+    "random.pdf": ["hello world"],
+}
+
+
+def _summary(results):
+    return [(repr(info), type(strategy).__name__) for info, strategy in results]
+
+
+def test_extraction_cache_is_off_by_default():
+    assert BaseConfig().cache_extractions is False
+
+
+def test_extraction_cache_hit_returns_the_same_result(tmp_path, make_pdf, make_config):
+    paths = [make_pdf(name, lines) for name, lines in STATEMENTS.items()]
+    cache_dir = tmp_path / "extraction_cache"
+    config = make_config({"cache_extractions": True, "extraction_cache_dir": str(cache_dir), "max_workers": 1})
+
+    first, first_stats = PDFProcessor(config).process_pdfs(paths)
+    assert "extraction_cache_hits" not in first_stats
+    # Only successful extractions are stored, as JSON
+    stored = sorted(os.listdir(cache_dir))
+    assert stored and all(name.endswith(".json") for name in stored)
+    assert len(stored) == sum(1 for info, _ in first if info is not None)
+
+    second, second_stats = PDFProcessor(config).process_pdfs(paths)
+    assert _summary(second) == _summary(first)
+    assert [info and info.date for info, _ in second] == [info and info.date for info, _ in first]
+    assert second_stats["extraction_cache_hits"] == len(stored)
+
+
+def test_extraction_cache_key_changes_with_config(make_pdf, make_config):
+    path = make_pdf("dxweb_1.pdf", STATEMENTS["dxweb_1.pdf"])
+    base = {"cache_extractions": True}
+    key = PDFProcessor(make_config(base))._extraction_cache_key(path)
+    assert PDFProcessor(make_config(base))._extraction_cache_key(path) == key
+    edited = make_config(base, account_mappings={"bank_united_dxweb": {"3333": "DELTA OPERATING"}})
+    assert PDFProcessor(edited)._extraction_cache_key(path) != key
+
+
+def test_malformed_cache_entry_is_a_miss(tmp_path, make_pdf, make_config):
+    path = make_pdf("dxweb_1.pdf", STATEMENTS["dxweb_1.pdf"])
+    cache_dir = tmp_path / "extraction_cache"
+    config = make_config({"cache_extractions": True, "extraction_cache_dir": str(cache_dir), "max_workers": 1})
+    processor = PDFProcessor(config)
+    os.makedirs(cache_dir)
+    (cache_dir / f"{processor._extraction_cache_key(path)}.json").write_text("{not json", encoding="utf-8")
+
+    [(info, strategy)], stats = processor.process_pdfs([path])
+    assert "extraction_cache_hits" not in stats
+    assert info is not None and type(strategy).__name__ == "BankUnitedStrategy"
+
+
+def _process(config, paths):
+    processor = PDFProcessor(config)
+    try:
+        return processor.process_pdfs(paths)
+    finally:
+        processor.close()
+
+
+def _statement_paths(make_pdf):
+    # Mixed banks, including unreadable-as-statement and filename-only files, in an order that is not sorted
+    paths = [make_pdf(name, lines) for name, lines in STATEMENTS.items()]
+    paths.append(make_pdf("NewStatement_4444.pdf", ["x"]))
+    paths.append(make_pdf("Statement_002.pdf", ["PNC Bank", "Account Number: XXXXXX1111",
+                                                "For the Period 05/01/2025 to 05/31/2025"]))
+    return paths[::-1]
+
+
+def test_worker_pool_gives_the_same_results_as_sequential(monkeypatch, make_pdf, make_config):
+    import pdf_processor
+    monkeypatch.setattr(pdf_processor.os, "cpu_count", lambda: 4)
+    paths = _statement_paths(make_pdf)
+
+    sequential, sequential_stats = _process(make_config({"max_workers": 1}), paths)
+    processor = PDFProcessor(make_config({"max_workers": 2}))
+    try:
+        pooled, pooled_stats = processor.process_pdfs(paths)
+        assert isinstance(processor._executor, concurrent.futures.ProcessPoolExecutor)
+    finally:
+        processor.close()
+    assert _summary(pooled) == _summary(sequential)
+    assert [info and info.date for info, _ in pooled] == [info and info.date for info, _ in sequential]
+    assert pooled_stats == sequential_stats
+    # Results come back in file_paths order
+    assert [info.original_filename for info, _ in pooled if info] == \
+        [os.path.basename(path) for path, (info, _) in zip(paths, pooled) if info]
+
+
+class _BreakingExecutor:
+    """Stands in for a ProcessPoolExecutor whose workers die after the first `survivors` files."""
+
+    def __init__(self, processor, survivors):
+        self.processor = processor
+        self.survivors = survivors
+        self.shut_down = False
+
+    def map(self, fn, file_paths, chunksize=1):
+        for file_path in file_paths[:self.survivors]:
+            yield self.processor._extract_one(file_path)
+        raise concurrent.futures.process.BrokenProcessPool("a worker died")
+
+    def shutdown(self, wait=True, cancel_futures=False):
+        self.shut_down = True
+
+
+def test_broken_worker_pool_finishes_sequentially(monkeypatch, make_pdf, make_config):
+    import pdf_processor
+    monkeypatch.setattr(pdf_processor.os, "cpu_count", lambda: 4)
+    paths = _statement_paths(make_pdf)
+    expected, expected_stats = _process(make_config({"max_workers": 1}), paths)
+
+    config = make_config({"max_workers": 2})
+    processor = PDFProcessor(config)
+    broken = processor._executor = _BreakingExecutor(PDFProcessor(config), survivors=2)
+    results, stats = processor.process_pdfs(paths)
+    assert _summary(results) == _summary(expected)
+    assert stats == expected_stats
+    # The broken pool is dropped, so the next call starts a fresh one
+    assert broken.shut_down and processor._executor is None